@@ -1,8 +1,73 @@
 # Game settings
+import os
+
 BOARD_SIZE = 3        # ukuran papan (3x3)
 WIN_LENGTH = 3        # jumlah simbol untuk menang
+RULE_VARIANT = "infinite"  # preset di game/variants.py: infinite, classic, oldest_own, three_pieces, gravity
+
+# Repetition detection (infinite mode)
+REPETITION_DRAW_LIMIT = 3   # seri jika posisi yang sama muncul N kali (0 = nonaktif)
+REPETITION_WINDOW = 1000    # jumlah posisi terakhir yang diingat
+REPETITION_AVOID = True     # AI menghindari posisi berulang saat unggul
+
+# Medium AI policy table (generate: python -m game.policy)
+MEDIUM_POLICY_TEMPERATURE = 20  # 0 = selalu langkah terbaik, makin besar makin acak
+
+# AI search on larger boards
+THREAT_SEARCH_DEPTH = 4     # kedalaman threat-space search (jumlah four beruntun)
+LARGE_BOARD_DEPTH = 2       # batas kedalaman minimax untuk papan > 3x3
+LARGE_BOARD_BRANCHING = 10  # jumlah kandidat langkah per node di papan besar
+TT_MAX_ENTRIES = 100000     # transposition table dikosongkan jika melewati batas ini
+PONDER_ENABLED = True       # AI hard berpikir di waktu giliran pemain
+SEARCH_STOP_TIMEOUT = 1.0   # detik menunggu thread ponder/analisis berhenti sebelum lanjut
+AI_MOVE_DEADLINE = 10.0     # detik per langkah AI di GUI; lewat batas = langkah fallback (None = tanpa batas)
+AI_MOVE_DELAY_MS = 800      # jeda sebelum AI jalan di GUI supaya langkahnya terlihat
+ASYNC_POLL_MS = 15          # interval Tk menjalankan event loop asyncio
+EVALUATOR_PATH = None       # file evaluator hasil training (python -m game.learn); None = heuristik
+
+# Opening book (python -m game.book)
+BOOK_ENABLED = True         # AI medium/hard memakai book bila file-nya sudah dibuat
+BOOK_MAX_PLIES = 8          # kedalaman book (jumlah langkah pertama)
+BOOK_MIN_GAMES = 5          # langkah yang lebih jarang dimainkan dibuang
+
+# Proof-number solver (python -m game.solver)
+SOLVER_CONFIGS = [("classic", 3, 3), ("classic", 4, 3), ("gravity", 4, 3)]  # (varian, ukuran, K)
+SOLVER_MAX_NODES = 20000    # batas node per pembuktian saat dipakai AI; lewat batas = UNKNOWN
+ENDGAME_SOLVER_EMPTY = 12   # AI hard memakai solver bila sel kosong <= ini dan search biasa tidak sampai akhir
+
+# Hint / analisis di GUI
+ANALYSIS_PV_LENGTH = 6      # panjang principal variation yang ditampilkan
+HINT_POLL_MS = 100          # interval GUI membaca hasil analisis terbaru
+
+# Session autosave (resume game yang belum selesai)
+SAVE_PATH = os.path.join(os.path.expanduser("~"), ".tictactoe_session.jsonl")
+SAVE_AI_CACHE = False       # simpan juga transposition table AI
+SESSION_COMPACT_EVERY = 50  # tulis snapshot baru setiap N move
+
+# Metrics export (None = nonaktif)
+METRICS_PORT = None           # endpoint Prometheus di http://127.0.0.1:PORT/metrics
+METRICS_JSON_PATH = None      # dump JSON berkala
+METRICS_JSON_INTERVAL = 10    # detik
+
+# Tournament (python -m game.tournament)
+TOURNAMENT_ENGINES = [
+    {"name": "easy", "difficulty": "easy"},
+    {"name": "medium", "difficulty": "medium"},
+    {"name": "hard-d2", "difficulty": "hard", "max_depth": 2},
+    {"name": "hard", "difficulty": "hard"},
+    {"name": "hard-50ms", "difficulty": "hard", "time": 0.05},  # "time": detik per langkah
+]
+TOURNAMENT_VARIANTS = [("infinite", 3, 3)]  # (varian, board_size, win_length)
+TOURNAMENT_GAMES = 20              # game per pasangan engine (warna bergantian)
+TOURNAMENT_MAX_MOVES = 200         # batas langkah per game; lewat batas = seri
+TOURNAMENT_SEED = 0                # seed utama; setiap game mendapat stream turunan sendiri
+DISTRIBUTED_PORT = 5577            # port coordinator (python -m game.distributed)
 WINDOW_TITLE = "Tic Tac Toe - Infinite Mode"
-CELL_SIZE = 50
+CELL_SIZE = 50        # ukuran sel awal (px) di viewport papan
+CELL_SIZE_MIN = 6     # batas zoom out (px per sel)
+CELL_SIZE_MAX = 120   # batas zoom in
+VIEW_SIZE = 420       # lebar/tinggi canvas papan (px); papan lebih besar digeser (drag) dan di-zoom (scroll)
+DRAG_THRESHOLD = 5    # geser mouse lebih dari ini (px) = pan, bukan klik
 FONT = ("Arial", 16, "bold")
 TITLE_FONT = ("Arial", 24, "bold")
 STATUS_FONT = ("Arial", 14, "bold")
@@ -19,3 +84,5 @@ BUTTON_HOVER = "#3d3d3d" # Button hover
 BUTTON_FG = "#ffffff"    # Button text putih
 BORDER_COLOR = "#444444" # Border color
 TEXT_INFO = "#a0a0a0"    # Info text color
+HINT_GOOD = "#2E7D32"    # Heatmap: langkah terbaik
+HINT_BAD = "#7A2020"     # Heatmap: langkah terburuk
@@ -1,131 +1,409 @@
 # AI Player with different difficulty levels
+import copy
 import random
+import time
+from game import metrics
 from game.board import Board
+from game.book import load_book
+from game.encoding import pack_scores, unpack_scores
+from game.learn import features, load_evaluator
+from game.policy import load_policy
+from game.rules import get_tables
+from game.solver import Solver
+from game.threats import SearchStopped, ThreatSpace
+from game.variants import get_variant
+from config.settings import (
+    WIN_LENGTH, MEDIUM_POLICY_TEMPERATURE, THREAT_SEARCH_DEPTH, LARGE_BOARD_DEPTH,
+    LARGE_BOARD_BRANCHING, TT_MAX_ENTRIES, EVALUATOR_PATH, ENDGAME_SOLVER_EMPTY,
+    BOOK_ENABLED, BOOK_MAX_PLIES
+)
+
 
 class AIPlayer:
-    def __init__(self, board, difficulty="medium"):
+    def __init__(self, board, difficulty="medium", ai_symbol="O", max_depth=9, win_length=WIN_LENGTH,
+                 tt=None, evaluator=None, variant=None, rng=None):
         self.board = board
         self.difficulty = difficulty  # easy, medium, hard
-        self.ai_symbol = "O"
-        self.human_symbol = "X"
+        self.max_depth = max_depth  # batas kedalaman minimax untuk hard
+        self.win_length = win_length
+        self.ai_symbol = ai_symbol
+        self.human_symbol = "X" if ai_symbol == "O" else "O"
+        self.windows = get_tables(board.size, win_length)[0]
+        # Varian aturan menentukan langkah legal (mis. gravity); default dari RULE_VARIANT
+        self.variant = variant or get_variant().resized(board.size, win_length)
+        self.threats = ThreatSpace(board, win_length, self.variant)
+        # Papan besar: search dibatasi ke kandidat terurut ancaman
+        self.large_board = board.size > 3
+        self.win_score = 100 if not self.large_board else 10 ** 6
+        # Medium memakai tabel policy hasil engine hard (kalau sudah di-generate untuk ukuran ini)
+        use_policy = difficulty == "medium" and not self.variant.gravity
+        self.policy = load_policy(board.size, win_length) if use_policy else None
+        self.policy_temperature = MEDIUM_POLICY_TEMPERATURE
+        self.repetition_after = None  # callback (row, col) -> kemunculan posisi setelah langkah itu (GameController)
+        # Transposition table: key posisi -> skor per langkah (packed int); bisa dibagi dengan thread ponder
+        self.tt = tt if tt is not None else {}
+        self.stop_event = None
+        self.track_metrics = True
+        self.last_move_seconds = 0.0
+        self.move_deadline = None  # detik per langkah lewat ai_move_async (None = deadline pemanggil)
+        # Evaluator hasil training (game/learn.py) menggantikan heuristik di daun search
+        if evaluator is None and EVALUATOR_PATH and difficulty == "hard":
+            evaluator = load_evaluator(EVALUATOR_PATH)
+        self.evaluator = evaluator
+        self.eval_scale = self.win_score // 4
+        # Stream acak milik engine ini (lihat game/seeding.py), bukan modul random global
+        self.rng = rng if rng is not None else random.Random()
+        # Endgame: proof-number solver saat sel kosong sedikit (lihat game/solver.py)
+        use_solver = difficulty == "hard" and Solver.supports(self.variant)
+        self.solver = Solver(self.variant) if use_solver else None
+        self.endgame_empty = ENDGAME_SOLVER_EMPTY
+        # Opening book dari arsip game (python -m game.book), kalau sudah dibuat untuk varian ini.
+        # Kunci book hanya batu di papan, tanpa umur batu / urutan penghapusan, jadi varian
+        # yang mengangkat atau menghapus batu tidak memakainya
+        use_book = BOOK_ENABLED and difficulty in ("medium", "hard") and not self.variant.removes_pieces()
+        self.book = load_book(self.variant) if use_book else None
+
+    @property
+    def stop_event(self):
+        return self._stop_event
+
+    @stop_event.setter
+    def stop_event(self, event):
+        # Threat search dan solver berhenti pada event yang sama dengan minimax
+        self._stop_event = event
+        self.threats.stop_event = event
+        if getattr(self, "solver", None) is not None:
+            self.solver.stop_event = event
+
+    def copy(self, board, rng=None):
+        """Same engine bound to another board, sharing tt, solver proofs, book, policy and evaluator"""
+        clone = copy.copy(self)
+        clone.board = board
+        # Hanya state yang terikat papan / thread yang dibuat baru; tabel window tetap dari cache
+        clone.threats = ThreatSpace(board, self.win_length, self.variant)
+        clone.solver = self.solver.fork() if self.solver else None
+        clone._stop_event = None
+        clone.repetition_after = None
+        clone.track_metrics = True
+        clone.last_move_seconds = 0.0
+        # Default stream acak sendiri: ponder tidak boleh menggeser urutan acak engine utama
+        clone.rng = rng if rng is not None else random.Random()
+        return clone
 
     def get_best_move(self):
         """Get the best move based on difficulty"""
+        start = time.perf_counter()
         if self.difficulty == "easy":
-            return self._get_easy_move()
+            move = self._get_easy_move()
         elif self.difficulty == "medium":
-            return self._get_medium_move()
+            move = self._get_medium_move()
         else:
-            return self._get_hard_move()
+            move = self._get_hard_move()
+        self.last_move_seconds = time.perf_counter() - start
+        if self.track_metrics:
+            metrics.AI_MOVE_SECONDS.observe(self.last_move_seconds)
+        return move
+
+    def fallback_move(self):
+        """Cheap move when the search ran out of time: cached best, forced win/block, or threat order"""
+        cached = self.cached_scores()
+        if cached:
+            return max(cached, key=lambda item: item[1])[0]
+        for player in (self.ai_symbol, self.human_symbol):
+            cells = self.threats.winning_cells(player)
+            if cells:
+                return cells[0]
+        moves = self._search_moves(self.ai_symbol)
+        return moves[0] if moves else None
 
     def _get_easy_move(self):
         """Easy: Random move"""
         available_moves = self._get_available_moves()
-        return random.choice(available_moves) if available_moves else None
+        return self.rng.choice(available_moves) if available_moves else None
 
     def _get_medium_move(self):
-        """Medium: Mix of smart and random moves"""
+        """Medium: Policy table lookup, or a mix of smart and random moves"""
+        if self.policy:
+            move = self.policy.choose(self.board, self.ai_symbol, self.policy_temperature, self.rng)
+            if move:
+                return move
+        move = self._book_move()
+        if move:
+            return move
+
         available_moves = self._get_available_moves()
         
         # 50% chance untuk smart move, 50% random
-        if random.random() < 0.5:
+        if self.rng.random() < 0.5:
             smart_move = self._find_smart_move()
             if smart_move:
                 return smart_move
         
-        return random.choice(available_moves) if available_moves else None
+        return self.rng.choice(available_moves) if available_moves else None
 
     def _get_hard_move(self):
-        """Hard: Minimax algorithm"""
+        """Hard: Threat fast path, then minimax"""
         available_moves = self._get_available_moves()
         if not available_moves:
             return None
         
+        # Menang langsung, blok wajib, forced win dari threat-space search, atau satu-satunya pertahanan
+        forced = self.threats.must_play(self.ai_symbol, self.human_symbol, THREAT_SEARCH_DEPTH)
+        if forced:
+            return forced
+        # Lawan punya forced win (mis. open three): minimax hanya memilih di antara pertahanannya
+        defences = self.threats.defences(self.ai_symbol, self.human_symbol, THREAT_SEARCH_DEPTH)
+        
+        move = self._book_move() if defences is None else None
+        if move:
+            return move
+        
+        losing = set()
+        if self._use_solver():
+            move = self.solver.winning_move(self.board, self.ai_symbol)
+            if move:
+                return move
+            losing = self.solver.losing_moves(self.board, self.ai_symbol)
+        
+        scored = self._score_moves()
+        # Buang langkah yang terbukti kalah; kalau semua kalah, minimax memilih yang paling lama
+        scored = [item for item in scored if item[0] not in losing] or scored
+        if defences:
+            # Papan besar hanya men-search kandidat terdekat; pertahanan di luar itu tetap dimainkan
+            scored = [item for item in scored if item[0] in defences] or [(defences[0], 0)]
+        
         best_score = float('-inf')
-        best_move = available_moves[0]
+        best_move = None
+        fresh_best_score = float('-inf')
+        fresh_best_move = None
         
-        for row, col in available_moves:
-            self.board.grid[row][col] = self.ai_symbol
-            score = self._minimax(0, False)
-            self.board.grid[row][col] = ""
+        for (row, col), score in scored:
+            repeats = 0
+            if self.repetition_after:
+                # Key posisi sesudah penghapusan varian, sama dengan yang dicatat controller
+                repeats = self.repetition_after(row, col)
             
             if score > best_score:
                 best_score = score
                 best_move = (row, col)
+            if not repeats and score > fresh_best_score:
+                fresh_best_score = score
+                fresh_best_move = (row, col)
         
+        # Saat unggul, pilih langkah yang tetap menang tapi tidak mengulang posisi
+        if best_score > 0 and fresh_best_move and fresh_best_score > 0:
+            return fresh_best_move
         return best_move
 
-    def _minimax(self, depth, is_maximizing, max_depth=9):
-        """Minimax with depth-first search and better heuristics"""
+    def _book_move(self):
+        """Book move for the first BOOK_MAX_PLIES plies, else None"""
+        if self.book is None:
+            return None
+        # Tanpa penghapusan (syarat book) setiap langkah menambah satu batu: jumlah batu = ply
+        if self.board.stones >= BOOK_MAX_PLIES:
+            return None
+        return self.book.best_move(self.board, self.ai_symbol)
+
+    def _use_solver(self):
+        """Solver only pays off when minimax cannot already see the end of the game"""
+        if self.solver is None:
+            return False
+        empty = self.board.size * self.board.size - self.board.stones
+        return self.search_depth() < empty <= self.endgame_empty
+
+    def _score_moves(self):
+        """Minimax score of every root move, cached in the transposition table"""
+        key = self.board.key(self.ai_symbol)
+        scores = self.tt.get(key)
+        if self.track_metrics:
+            metrics.AI_CACHE_LOOKUPS.inc()
+            if scores is not None:
+                metrics.AI_CACHE_HITS.inc()
+        if scores is not None:
+            return unpack_scores(scores, self.board.size)
+        
+        scores = self._search_root()
+        if len(self.tt) >= TT_MAX_ENTRIES:
+            self.tt.clear()
+        self.tt[key] = pack_scores(scores, self.board.size)
+        return scores
+
+    def _search_root(self, max_depth=None):
+        """Uncached minimax score of every root move (max_depth defaults to the engine's)"""
+        available_moves = self._get_available_moves()
+        max_depth = self.max_depth if max_depth is None else min(max_depth, self.max_depth)
+        if self.large_board:
+            available_moves = self._search_moves(self.ai_symbol)
+            max_depth = min(max_depth, LARGE_BOARD_DEPTH)
+        
+        scores = []
+        for row, col in available_moves:
+            undo = self.variant.play_move(self.board, row, col, self.ai_symbol)
+            try:
+                scores.append(((row, col), self._minimax(0, False, max_depth)))
+            finally:
+                self.variant.undo_move(self.board, row, col, undo)
+        return scores
+
+    def search_depth(self):
+        """Depth the root search actually uses on this board"""
+        return min(self.max_depth, LARGE_BOARD_DEPTH) if self.large_board else self.max_depth
+
+    def cached_scores(self):
+        """Root scores for ai_symbol to move from the transposition table, or None (never searches)"""
+        scores = self.tt.get(self.board.key(self.ai_symbol))
+        return unpack_scores(scores, self.board.size) if scores is not None else None
+
+    def move_scores(self):
+        """[((row, col), score), ...] best first; searched only if not cached"""
+        return sorted(self._score_moves(), key=lambda item: -item[1])
+
+    def principal_variation(self, max_length=None):
+        """Expected line [(row, col, player), ...] read from cached scores only.
+
+        Tiap langkah mengambil skor terbaik dari entry transposition table untuk pemain
+        yang sedang jalan; berhenti di posisi yang belum pernah di-search. Papan dipakai
+        sementara lalu dikembalikan, jadi jalankan pada salinan bila ada thread lain.
+        """
+        max_length = max_length or self.board.size * self.board.size
+        line = []
+        undos = []
+        mover, other = self.ai_symbol, self.human_symbol
+        try:
+            while len(line) < max_length:
+                scores = self.tt.get(self.board.key(mover))
+                if not scores:
+                    break
+                (row, col), _ = max(unpack_scores(scores, self.board.size), key=lambda item: item[1])
+                if not self.board.is_empty(row, col):
+                    break
+                undos.append(self.variant.play_move(self.board, row, col, mover))
+                line.append((row, col, mover))
+                if self._check_win_for(mover):
+                    break
+                mover, other = other, mover
+        finally:
+            for (row, col, _), undo in zip(reversed(line), reversed(undos)):
+                self.variant.undo_move(self.board, row, col, undo)
+        return line
+
+    def _minimax(self, depth, is_maximizing, max_depth=9, alpha=float('-inf'), beta=float('inf')):
+        """Minimax with alpha-beta; the root calls it with the full window, so root scores stay exact"""
+        if self._stop_event is not None and self._stop_event.is_set():
+            raise SearchStopped()
+        
         # Check win conditions
         ai_wins = self._check_win_for(self.ai_symbol)
         human_wins = self._check_win_for(self.human_symbol)
         
         if ai_wins:
-            return 100 - depth  # Prioritize faster wins
+            return self.win_score - depth  # Prioritize faster wins
         if human_wins:
-            return depth - 100  # Prioritize blocking earlier
-        
-        available_moves = self._get_available_moves()
-        if not available_moves:
-            return 0  # Draw
+            return depth - self.win_score  # Prioritize blocking earlier
         
         if depth >= max_depth:
             # Heuristic evaluation at max depth
+            if not self._get_available_moves():
+                return 0
+            if self.evaluator is not None:
+                return self._learned_scores([self._leaf_features(not is_maximizing)], not is_maximizing)[0]
             return self._evaluate_board()
         
         if is_maximizing:
+            available_moves = self._search_moves(self.ai_symbol)
+            if not available_moves:
+                return 0  # Draw
+            if self.evaluator is not None and depth + 1 >= max_depth:
+                return self._frontier(depth, True, available_moves)
             best_score = float('-inf')
             for row, col in available_moves:
-                self.board.grid[row][col] = self.ai_symbol
-                score = self._minimax(depth + 1, False, max_depth)
-                self.board.grid[row][col] = ""
+                undo = self.variant.play_move(self.board, row, col, self.ai_symbol)
+                try:
+                    score = self._minimax(depth + 1, False, max_depth, alpha, beta)
+                finally:
+                    self.variant.undo_move(self.board, row, col, undo)
                 best_score = max(score, best_score)
-                # Alpha-beta pruning optimization
-                if best_score > 50:
+                alpha = max(alpha, best_score)
+                # Sudah menang, atau lawan tidak akan membiarkan cabang ini
+                if best_score > self.win_score // 2 or alpha >= beta:
                     break
             return best_score
         else:
+            available_moves = self._search_moves(self.human_symbol)
+            if not available_moves:
+                return 0  # Draw
+            if self.evaluator is not None and depth + 1 >= max_depth:
+                return self._frontier(depth, False, available_moves)
             best_score = float('inf')
             for row, col in available_moves:
-                self.board.grid[row][col] = self.human_symbol
-                score = self._minimax(depth + 1, True, max_depth)
-                self.board.grid[row][col] = ""
+                undo = self.variant.play_move(self.board, row, col, self.human_symbol)
+                try:
+                    score = self._minimax(depth + 1, True, max_depth, alpha, beta)
+                finally:
+                    self.variant.undo_move(self.board, row, col, undo)
                 best_score = min(score, best_score)
-                # Alpha-beta pruning optimization
-                if best_score < -50:
+                beta = min(beta, best_score)
+                if best_score < -self.win_score // 2 or alpha >= beta:
                     break
             return best_score
 
+    def _frontier(self, depth, is_maximizing, moves):
+        """Score all leaf children with one batched evaluator call"""
+        symbol = self.ai_symbol if is_maximizing else self.human_symbol
+        scores = []
+        rows = []
+        for row, col in moves:
+            undo = self.variant.play_move(self.board, row, col, symbol)
+            try:
+                if self._check_win_for(symbol):
+                    win = self.win_score - (depth + 1)
+                    scores.append(win if is_maximizing else -win)
+                elif not self._get_available_moves():
+                    scores.append(0)
+                else:
+                    rows.append(self._leaf_features(is_maximizing))
+            finally:
+                self.variant.undo_move(self.board, row, col, undo)
+        
+        if rows:
+            scores.extend(self._learned_scores(rows, is_maximizing))
+        return max(scores) if is_maximizing else min(scores)
+
+    def _leaf_features(self, ai_just_moved):
+        """Features from the point of view of the player who made the last move"""
+        mover = self.ai_symbol if ai_just_moved else self.human_symbol
+        return features(self.board, self.win_length, mover)
+
+    def _learned_scores(self, rows, ai_just_moved):
+        """Map evaluator win probabilities to minimax scores for the AI"""
+        probabilities = self.evaluator.evaluate_batch(rows)
+        if not ai_just_moved:
+            probabilities = 1 - probabilities
+        return [int(round((p - 0.5) * 2 * self.eval_scale)) for p in probabilities]
+
     def _find_smart_move(self):
         """Find smart move with priority: win > block > 2-in-a-row > center > corner"""
         available_moves = self._get_available_moves()
         
         # Priority 1: Find winning move (immediately winning)
-        for row, col in available_moves:
-            self.board.grid[row][col] = self.ai_symbol
-            if self._check_win_for(self.ai_symbol):
-                self.board.grid[row][col] = ""
-                return (row, col)
-            self.board.grid[row][col] = ""
+        wins = self.threats.winning_cells(self.ai_symbol)
+        if wins:
+            return wins[0]
         
         # Priority 2: Block opponent's winning move
-        for row, col in available_moves:
-            self.board.grid[row][col] = self.human_symbol
-            if self._check_win_for(self.human_symbol):
-                self.board.grid[row][col] = ""
-                return (row, col)
-            self.board.grid[row][col] = ""
+        blocks = self.threats.winning_cells(self.human_symbol)
+        if blocks:
+            return blocks[0]
         
         # Priority 3: Make two in a row (set up winning move)
         two_in_row_moves = []
         for row, col in available_moves:
-            self.board.grid[row][col] = self.ai_symbol
+            self.board.place(row, col, self.ai_symbol)
             # Count how many 2-in-a-row lines this creates
             two_count = self._count_two_in_row()
             if two_count > 0:
                 two_in_row_moves.append((row, col, two_count))
-            self.board.grid[row][col] = ""
+            self.board.clear(row, col)
         
         if two_in_row_moves:
             # Return move that creates most 2-in-a-row
@@ -134,117 +412,124 @@ class AIPlayer:
         
         # Priority 4: Block opponent's 2-in-a-row
         for row, col in available_moves:
-            self.board.grid[row][col] = self.human_symbol
+            self.board.place(row, col, self.human_symbol)
             two_count = self._count_two_in_row()
             if two_count > 0:
-                self.board.grid[row][col] = ""
+                self.board.clear(row, col)
                 return (row, col)
-            self.board.grid[row][col] = ""
+            self.board.clear(row, col)
         
         # Priority 5: Take center
-        center = 1
-        if self.board.is_empty(center, center):
+        center = self.board.size // 2
+        if self.variant.is_legal(self.board, center, center):
             return (center, center)
         
         # Priority 6: Take corner
-        corners = [(0, 0), (0, 2), (2, 0), (2, 2)]
-        empty_corners = [c for c in corners if self.board.is_empty(c[0], c[1])]
+        n = self.board.size - 1
+        corners = [(0, 0), (0, n), (n, 0), (n, n)]
+        empty_corners = [c for c in corners if self.variant.is_legal(self.board, c[0], c[1])]
         if empty_corners:
-            return random.choice(empty_corners)
+            return self.rng.choice(empty_corners)
         
         return None
 
     def _count_two_in_row(self):
         """Count how many 2-in-a-row lines exist for current board state"""
         count = 0
+        size = self.board.size
         directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
         
-        for row in range(3):
-            for col in range(3):
+        for row in range(size):
+            for col in range(size):
                 if self.board.get(row, col) == self.ai_symbol:
                     for dr, dc in directions:
                         # Look ahead
                         r, c = row + dr, col + dc
-                        if 0 <= r < 3 and 0 <= c < 3 and self.board.get(r, c) == self.ai_symbol:
+                        if 0 <= r < size and 0 <= c < size and self.board.get(r, c) == self.ai_symbol:
                             count += 1
         return count
 
     def _check_win_for(self, symbol):
         """Check if symbol has a winning position"""
-        directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
+        grid = self.board.grid
+        size = self.board.size
         
-        for row in range(3):
-            for col in range(3):
-                if self.board.get(row, col) == symbol:
-                    for dr, dc in directions:
-                        count = 1
-                        # Check forward
-                        r, c = row + dr, col + dc
-                        while 0 <= r < 3 and 0 <= c < 3 and self.board.get(r, c) == symbol:
-                            count += 1
-                            r += dr
-                            c += dc
-                        # Check backward
-                        r, c = row - dr, col - dc
-                        while 0 <= r < 3 and 0 <= c < 3 and self.board.get(r, c) == symbol:
-                            count += 1
-                            r -= dr
-                            c -= dc
-                        if count >= 3:
-                            return True
+        for window in self.windows:
+            for idx in window:
+                if grid[idx // size][idx % size] != symbol:
+                    break
+            else:
+                return True
         return False
 
     def _get_available_moves(self):
         """Get all available moves"""
+        if self.variant.gravity:
+            return self.variant.legal_moves(self.board)
         available = []
-        for row in range(3):
-            for col in range(3):
+        for row in range(self.board.size):
+            for col in range(self.board.size):
                 if self.board.is_empty(row, col):
                     available.append((row, col))
         return available
 
+    def _search_moves(self, player):
+        """Moves searched by minimax: all on 3x3, threat-ordered neighbours on large boards"""
+        if not self.large_board:
+            return self._get_available_moves()
+        if self.variant.gravity:
+            moves = self._get_available_moves()
+            moves.sort(key=lambda m: -self.threats.move_score(m[0], m[1], player))
+            return moves[:LARGE_BOARD_BRANCHING]
+        
+        size = self.board.size
+        candidates = set()
+        has_stones = False
+        for row in range(size):
+            for col in range(size):
+                if not self.board.is_empty(row, col):
+                    has_stones = True
+                    for r in range(max(0, row - 1), min(size, row + 2)):
+                        for c in range(max(0, col - 1), min(size, col + 2)):
+                            if self.board.is_empty(r, c):
+                                candidates.add((r, c))
+        if not has_stones:
+            return [(size // 2, size // 2)]
+        if not candidates:
+            candidates = self._get_available_moves()
+        
+        ordered = sorted(candidates, key=lambda m: -self.threats.move_score(m[0], m[1], player))
+        return ordered[:LARGE_BOARD_BRANCHING]
+
     def _evaluate_board(self):
         """Evaluate board position with heuristics"""
         score = 0
+        grid = self.board.grid
+        size = self.board.size
         
-        # Check all possible 3-in-a-row lines
-        lines = [
-            # Rows
-            [(0, 0), (0, 1), (0, 2)],
-            [(1, 0), (1, 1), (1, 2)],
-            [(2, 0), (2, 1), (2, 2)],
-            # Columns
-            [(0, 0), (1, 0), (2, 0)],
-            [(0, 1), (1, 1), (2, 1)],
-            [(0, 2), (1, 2), (2, 2)],
-            # Diagonals
-            [(0, 0), (1, 1), (2, 2)],
-            [(0, 2), (1, 1), (2, 0)],
-        ]
-        
-        for line in lines:
-            ai_count = sum(1 for r, c in line if self.board.get(r, c) == self.ai_symbol)
-            human_count = sum(1 for r, c in line if self.board.get(r, c) == self.human_symbol)
-            empty_count = sum(1 for r, c in line if self.board.get(r, c) == "")
+        # Check all possible K-in-a-row windows
+        for window in self.windows:
+            ai_count = human_count = 0
+            for idx in window:
+                cell = grid[idx // size][idx % size]
+                if cell == self.ai_symbol:
+                    ai_count += 1
+                elif cell == self.human_symbol:
+                    human_count += 1
             
-            # AI scoring
+            # AI scoring: 5 untuk satu batu, 20 untuk dua, x4 per batu tambahan
             if human_count == 0 and ai_count > 0:
-                if ai_count == 2:
-                    score += 20  # Two in a row
-                elif ai_count == 1:
-                    score += 5   # One in a row
+                score += 5 * 4 ** (ai_count - 1)
             
             # Human blocking (negative)
             if ai_count == 0 and human_count > 0:
-                if human_count == 2:
-                    score -= 20  # Opponent has two in a row
-                elif human_count == 1:
-                    score -= 5   # Opponent has one in a row
+                score -= 5 * 4 ** (human_count - 1)
         
         # Prefer center
-        if self.board.get(1, 1) == self.ai_symbol:
+        center = size // 2
+        if self.board.get(center, center) == self.ai_symbol:
             score += 10
-        elif self.board.get(1, 1) == self.human_symbol:
+        elif self.board.get(center, center) == self.human_symbol:
             score -= 10
         
         return score
@@ -0,0 +1,135 @@
+# Background analysis for hints: per-move scores and principal variation
+#
+# Thread latar belakang menganalisis posisi pada salinan game untuk pemain yang sedang
+# jalan. Kalau skor posisi sudah ada di transposition table (dari AI, ponder, atau
+# analisis sebelumnya) hasilnya langsung dipakai; kalau belum, search dijalankan dengan
+# kedalaman bertambah (1, 2, ...) dan setiap kedalaman dipublikasikan. Setelah itu
+# principal variation diperpanjang dengan menganalisis posisi di ujungnya, sehingga
+# entry yang sama nanti juga dipakai AI saat pemain memainkan langkah yang disarankan.
+# GUI cukup memanggil latest() dari root.after(); tidak ada yang memblokir loop Tk.
+import threading
+
+from game.ai import AIPlayer, SearchStopped
+from config.settings import ANALYSIS_PV_LENGTH, SEARCH_STOP_TIMEOUT
+
+
+class Analyzer:
+    def __init__(self, controller, pv_length=ANALYSIS_PV_LENGTH):
+        self.controller = controller
+        self.pv_length = pv_length
+        # Pakai transposition table AI bila ada, supaya hint dan AI saling memakai hasil
+        self.tt = controller.ai_player.tt if controller.ai_player else {}
+        self._lock = threading.Lock()
+        self._latest = None
+        self._stop_event = None
+        self._thread = None
+        # Engine hard per pemain; tiap search memakai salinannya (solver proof ikut dibagi)
+        self._templates = {}
+
+    def start(self):
+        """Analyze the current position for the player to move"""
+        self.stop()
+        with self._lock:
+            self._latest = None
+        if self.controller.game_over:
+            return
+
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(self.controller.copy(), self._stop_event),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the analysis thread and wait for it (it writes to the AI's table)"""
+        if self._stop_event:
+            self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(SEARCH_STOP_TIMEOUT)
+        self._stop_event = None
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def latest(self):
+        """Newest result dict (key, player, win_score, depth, final, scores best first, pv) or None"""
+        with self._lock:
+            return self._latest
+
+    def _publish(self, engine, key, depth, final, scores, pv, stop_event):
+        result = {
+            "key": key,
+            "player": engine.ai_symbol,
+            "win_score": engine.win_score,
+            "depth": depth,
+            "final": final,
+            "scores": sorted(scores, key=lambda item: -item[1]),
+            "pv": pv,
+        }
+        with self._lock:
+            if not stop_event.is_set():
+                self._latest = result
+
+    def _engine(self, game, player, stop_event):
+        template = self._templates.get(player)
+        if template is None:
+            ai = game.ai_player
+            template = self._templates[player] = AIPlayer(
+                game.board, "hard", ai_symbol=player,
+                max_depth=ai.max_depth if ai else 9,
+                win_length=game.rules.win_length,
+                tt=self.tt,
+                evaluator=ai.evaluator if ai else None,
+                variant=game.variant,
+            )
+        engine = template.copy(game.board)
+        engine.stop_event = stop_event
+        engine.track_metrics = False
+        return engine
+
+    def _run(self, game, stop_event):
+        key = game.board.key(game.current_player)
+        engine = self._engine(game, game.current_player, stop_event)
+        full_depth = engine.search_depth()
+
+        try:
+            scores = engine.cached_scores()
+            if scores is None:
+                # Iterative deepening: hasil dangkal ditampilkan dulu, hanya hasil penuh yang di-cache
+                for depth in range(1, full_depth):
+                    scores = engine._search_root(depth)
+                    self._publish(engine, key, depth, False, scores, [], stop_event)
+                scores = engine._score_moves()
+            self._publish(engine, key, full_depth, True, scores, engine.principal_variation(self.pv_length),
+                          stop_event)
+
+            # Perpanjang PV: search posisi di ujung garis untuk pemain yang jalan di sana
+            while True:
+                pv = engine.principal_variation(self.pv_length)
+                if not pv or len(pv) >= self.pv_length or stop_event.is_set():
+                    return
+                if not self._extend(game, pv, stop_event):
+                    return
+                self._publish(engine, key, full_depth, True, scores, engine.principal_variation(self.pv_length),
+                              stop_event)
+        except SearchStopped:
+            return
+
+    def _extend(self, game, pv, stop_event):
+        """Search the position at the end of pv; False if the line is over"""
+        board = game.board
+        undos = [game.variant.play_move(board, row, col, mover) for row, col, mover in pv]
+        try:
+            last = pv[-1][2]
+            next_player = "O" if last == "X" else "X"
+            engine = self._engine(game, next_player, stop_event)
+            if engine._check_win_for(last):
+                return False
+            # Hasilnya masuk transposition table; PV berikutnya membacanya dari sana
+            return bool(engine._score_moves())
+        finally:
+            for (row, col, _), undo in zip(reversed(pv), reversed(undos)):
+                game.variant.undo_move(board, row, col, undo)
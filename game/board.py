@@ -1,14 +1,156 @@
 # Board data structure
+import random
+from collections import deque
+
+
+_MASK64 = (1 << 64) - 1
+_ORDER_BASE = 0x9E3779B97F4A7C15          # ganjil, jadi punya invers mod 2^64
+
+
+def _inverse64(value):
+    """Multiplicative inverse of an odd number modulo 2^64 (Newton iteration)"""
+    inv = value
+    for _ in range(6):
+        inv = (inv * (2 - value * inv)) & _MASK64
+    return inv
+
+
+_ORDER_BASE_INV = _inverse64(_ORDER_BASE)
+
+# Tabel Zobrist di-cache per ukuran papan; seed tetap supaya hash sama di semua proses
+_ZOBRIST_CACHE = {}
+SIDE_TO_MOVE_KEY = random.Random(0x5EED).getrandbits(64)
+
+
+def zobrist_table(size):
+    """Return {player: [key per flat cell]} for a board size"""
+    table = _ZOBRIST_CACHE.get(size)
+    if table is None:
+        rng = random.Random(0x5EED + size)
+        table = {
+            "X": [rng.getrandbits(64) for _ in range(size * size)],
+            "O": [rng.getrandbits(64) for _ in range(size * size)],
+        }
+        _ZOBRIST_CACHE[size] = table
+    return table
+
+
 class Board:
-    def __init__(self, size):
+    __slots__ = ("size", "grid", "stones", "zobrist", "hash", "track_order", "order", "order_hash", "_order_power")
+
+    def __init__(self, size, track_order=False):
         self.size = size
         self.grid = [["" for _ in range(size)] for _ in range(size)]
+        self.stones = 0  # jumlah sel terisi, supaya cek papan penuh tidak memindai grid
+        self.zobrist = zobrist_table(size)
+        self.hash = 0
+        # Hash urutan (untuk mode infinite): sum key_i * B^i atas antrian pemasangan
+        self.track_order = track_order
+        self.order = deque()
+        self.order_hash = 0
+        self._order_power = 1
 
     def is_empty(self, row, col):
         return self.grid[row][col] == ""
 
     def place(self, row, col, player):
+        old = self.grid[row][col]
+        if old:
+            self.clear(row, col)
         self.grid[row][col] = player
+        if player:
+            self.stones += 1
+            key = self.zobrist[player][row * self.size + col]
+            self.hash ^= key
+            if self.track_order:
+                self.order.append((row, col, key))
+                self.order_hash = (self.order_hash + key * self._order_power) & _MASK64
+                self._order_power = (self._order_power * _ORDER_BASE) & _MASK64
+
+    def clear(self, row, col):
+        player = self.grid[row][col]
+        if not player:
+            return
+        self.grid[row][col] = ""
+        self.stones -= 1
+        self.hash ^= self.zobrist[player][row * self.size + col]
+        if self.track_order:
+            self._remove_from_order(row, col)
+
+    def insert(self, index, row, col, player):
+        """place() at position index of the placement order (undoes a removal in search)"""
+        self.place(row, col, player)
+        if self.track_order and index < len(self.order) - 1:
+            self.order.insert(index, self.order.pop())
+            self._rehash_order()
+
+    def history(self):
+        """[(row, col, player), ...] in placement order (needs track_order)"""
+        return [(row, col, self.grid[row][col]) for row, col, _ in self.order]
+
+    def is_full(self):
+        return self.stones == self.size * self.size
 
     def get(self, row, col):
         return self.grid[row][col]
+
+    def copy(self):
+        """Independent copy including hashes and placement order"""
+        clone = Board(self.size, self.track_order)
+        clone.grid = [list(row) for row in self.grid]
+        clone.stones = self.stones
+        clone.hash = self.hash
+        clone.order = deque(self.order)
+        clone.order_hash = self.order_hash
+        clone._order_power = self._order_power
+        return clone
+
+    def key(self, to_move=None):
+        """Position key; includes history order when tracked and side-to-move if given"""
+        h = self.order_hash if self.track_order else self.hash
+        if to_move == "O":
+            h ^= SIDE_TO_MOVE_KEY
+        return h
+
+    def key_after(self, row, col, player, removed=(), to_move=None):
+        """key(to_move) after placing player at (row, col) and clearing the cells in removed"""
+        idx = row * self.size + col
+        if self.track_order:
+            gone = set(removed)
+            h, power = 0, 1
+            for r, c, key in self.order:
+                if (r, c) not in gone:
+                    h = (h + key * power) & _MASK64
+                    power = (power * _ORDER_BASE) & _MASK64
+            h = (h + self.zobrist[player][idx] * power) & _MASK64
+        else:
+            h = self.hash ^ self.zobrist[player][idx]
+            for r, c in removed:
+                h ^= self.zobrist[self.grid[r][c]][r * self.size + c]
+        if to_move == "O":
+            h ^= SIDE_TO_MOVE_KEY
+        return h
+
+    def _remove_from_order(self, row, col):
+        order = self.order
+        if order[0][0] == row and order[0][1] == col:
+            # Move paling awal (remove_oldest_move): geser semua suku satu pangkat ke bawah
+            key = order.popleft()[2]
+            self.order_hash = ((self.order_hash - key) * _ORDER_BASE_INV) & _MASK64
+            self._order_power = (self._order_power * _ORDER_BASE_INV) & _MASK64
+        elif order[-1][0] == row and order[-1][1] == col:
+            # Move paling akhir (undo saat search AI)
+            key = order.pop()[2]
+            self._order_power = (self._order_power * _ORDER_BASE_INV) & _MASK64
+            self.order_hash = (self.order_hash - key * self._order_power) & _MASK64
+        else:
+            # Penghapusan di tengah antrian: hitung ulang
+            self.order = deque(entry for entry in order if entry[0] != row or entry[1] != col)
+            self._rehash_order()
+
+    def _rehash_order(self):
+        self.order_hash = 0
+        self._order_power = 1
+        for _, _, key in self.order:
+            self.order_hash = (self.order_hash + key * self._order_power) & _MASK64
+            self._order_power = (self._order_power * _ORDER_BASE) & _MASK64
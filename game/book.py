@@ -0,0 +1,225 @@
+# Opening book learned from archived games
+#
+#     python -m game.tournament --games 200 --output games.jsonl
+#     python -m game.book games.jsonl --plies 8 --min-games 5
+#
+# Record game (JSON lines dari game.tournament / game.distributed) dibaca satu per satu
+# dan di-replay lewat GameController sesuai variannya. Untuk BOOK_MAX_PLIES langkah
+# pertama, posisi dilipat ke bentuk kanonik (simetri milik varian) dari sudut pandang
+# pemain yang jalan, lalu dihitung games / menang / seri per langkah. Langkah juga
+# dilipat: kalau posisinya sendiri simetris (mis. papan kosong), semua simetri yang
+# menghasilkan kunci terkecil dicoba dan indeks langkah terkecil yang dipakai, jadi
+# keempat pojok dihitung sebagai satu langkah. Langkah yang dimainkan kurang dari
+# BOOK_MIN_GAMES kali dibuang. Varian yang mengangkat/menghapus batu (infinite, oldest_own,
+# three_pieces) tidak punya book: kuncinya tidak memuat umur batu.
+#
+# Format file (little-endian, record berukuran tetap, urut menurut kunci):
+#   header : magic "TTTB", versi, ukuran papan, win_length, lebar kunci, jumlah record
+#   record : kunci posisi (base-3 big-endian) | indeks langkah kanonik u16 | games u32
+#            | menang u32 | seri u32
+# File di-mmap dan dicari dengan binary search, jadi tidak perlu dimuat ke memori.
+import argparse
+import json
+import mmap
+import os
+import struct
+
+from game.encoding import unpack_moves
+from game.policy import DATA_DIR
+from game.variants import get_variant
+from config.settings import BOOK_MAX_PLIES, BOOK_MIN_GAMES
+
+MAGIC = b"TTTB"
+BOOK_VERSION = 1
+_HEADER = struct.Struct("<4sBBBBI")
+_STATS = struct.Struct("<HIII")
+
+# Book yang sudah dibuka, per path (None = file tidak ada)
+_BOOK_CACHE = {}
+
+
+def book_path(variant):
+    return os.path.join(DATA_DIR, f"book_{variant.name}_{variant.board_size}x{variant.board_size}"
+                                  f"_k{variant.win_length}.bin")
+
+
+def key_width(size):
+    return ((3 ** (size * size) - 1).bit_length() + 7) // 8
+
+
+def canonical(board, mover, perms):
+    """(key int, perms) of the mover-relative position: every symmetry giving the smallest key"""
+    code = "".join("0" if cell == "" else ("1" if cell == mover else "2")
+                   for row in board.grid for cell in row)
+    best_key, best_perms = None, []
+    for perm in perms:
+        key = "".join(code[i] for i in perm)
+        if best_key is None or key < best_key:
+            best_key, best_perms = key, [perm]
+        elif key == best_key:
+            best_perms.append(perm)
+    return int(best_key, 3), best_perms
+
+
+def build_tree(records, variant, plies=BOOK_MAX_PLIES, tree=None):
+    """{position key: {canonical move: [games, wins, draws]}} from game records (updates tree)"""
+    from game.controller import GameController
+
+    perms = variant.tables()["symmetries"]
+    size = variant.board_size
+    tree = {} if tree is None else tree
+    for record in records:
+        controller = GameController(variant=variant, track_metrics=False)
+        for row, col, _ in unpack_moves(bytes.fromhex(record["archive"]), size)[:plies]:
+            mover = controller.current_player
+            key, best_perms = canonical(controller.board, mover, perms)
+            # Simetri yang tidak mengubah posisi memetakan langkah ke langkah yang setara
+            move = min(perm.index(row * size + col) for perm in best_perms)
+            stats = tree.setdefault(key, {}).setdefault(move, [0, 0, 0])
+            stats[0] += 1
+            if record["winner"] == mover:
+                stats[1] += 1
+            elif record["winner"] is None:
+                stats[2] += 1
+            controller.make_move(row, col)
+            if controller.game_over:
+                break
+    return tree
+
+
+def prune(tree, min_games=BOOK_MIN_GAMES):
+    """Drop moves played fewer than min_games times (and positions left empty)"""
+    pruned = {}
+    for key, moves in tree.items():
+        kept = {move: stats for move, stats in moves.items() if stats[0] >= min_games}
+        if kept:
+            pruned[key] = kept
+    return pruned
+
+
+def write_book(path, tree, size, win_length):
+    width = key_width(size)
+    rows = sorted((key, move, stats) for key, moves in tree.items() for move, stats in moves.items())
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, BOOK_VERSION, size, win_length, width, len(rows)))
+        for key, move, (games, wins, draws) in rows:
+            f.write(key.to_bytes(width, "big"))
+            f.write(_STATS.pack(move, games, wins, draws))
+    os.replace(tmp, path)
+    return len(rows)
+
+
+class OpeningBook:
+    """Read-only, memory-mapped opening book"""
+
+    def __init__(self, path, variant):
+        self.variant = variant
+        self.perms = variant.tables()["symmetries"]
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, win_length, width, count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != BOOK_VERSION:
+            raise ValueError(f"Not an opening book: {path}")
+        if (size, win_length) != (variant.board_size, variant.win_length):
+            raise ValueError(f"Book {path} is for {size}x{size}, {win_length} in a row")
+        self.size = size
+        self.width = width
+        self.count = count
+        self.record_size = width + _STATS.size
+
+    def _key_at(self, index):
+        offset = _HEADER.size + index * self.record_size
+        return self._map[offset:offset + self.width]
+
+    def entries(self, board, mover):
+        """[(row, col, games, wins, draws), ...] for the position, [] if not in book"""
+        key, best_perms = canonical(board, mover, self.perms)
+        perm = best_perms[0]
+        target = key.to_bytes(self.width, "big")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        result = []
+        while lo < self.count and self._key_at(lo) == target:
+            offset = _HEADER.size + lo * self.record_size + self.width
+            move, games, wins, draws = _STATS.unpack_from(self._map, offset)
+            row, col = divmod(perm[move], self.size)
+            result.append((row, col, games, wins, draws))
+            lo += 1
+        return result
+
+    def best_move(self, board, mover):
+        """Legal book move with the best score (win = 1, draw = 0.5), or None"""
+        best, best_rank = None, None
+        for row, col, games, wins, draws in self.entries(board, mover):
+            if not self.variant.is_legal(board, row, col):
+                continue
+            rank = ((wins + 0.5 * draws) / games, games)
+            if best_rank is None or rank > best_rank:
+                best, best_rank = (row, col), rank
+        return best
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def load_book(variant):
+    """Open (and cache) the book for a variant, or None if it was not built"""
+    path = book_path(variant)
+    if path not in _BOOK_CACHE:
+        _BOOK_CACHE[path] = OpeningBook(path, variant) if os.path.exists(path) else None
+    return _BOOK_CACHE[path]
+
+
+def stream_records(paths):
+    """Yield game records with a move archive from JSON-lines files, one line at a time"""
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    if record.get("archive") is not None:
+                        yield record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build opening books from archived games")
+    parser.add_argument("archives", nargs="+", help="JSON-lines game records (game.tournament --output)")
+    parser.add_argument("--plies", type=int, default=BOOK_MAX_PLIES, help="book depth in moves")
+    parser.add_argument("--min-games", type=int, default=BOOK_MIN_GAMES, help="prune moves seen less often")
+    args = parser.parse_args()
+
+    # Satu pohon per konfigurasi (varian, ukuran, K) yang muncul di arsip
+    trees = {}
+    skipped = set()
+    for record in stream_records(args.archives):
+        variant = get_variant(record.get("variant", "infinite")).resized(record["board_size"], record["win_length"])
+        if variant.removes_pieces():
+            # Hasil langkah bergantung pada urutan batu, yang tidak ada di kunci book
+            skipped.add(variant.name)
+            continue
+        config = variant.key() + (variant.name,)
+        if config not in trees:
+            trees[config] = (variant, {})
+        variant, tree = trees[config]
+        build_tree([record], variant, args.plies, tree)
+
+    for name in sorted(skipped):
+        print(f"{name}: skipped (pieces are lifted or removed, so the book cannot key positions)")
+    for variant, tree in trees.values():
+        pruned = prune(tree, args.min_games)
+        path = book_path(variant)
+        count = write_book(path, pruned, variant.board_size, variant.win_length)
+        print(f"{path}: {len(pruned)} positions, {count} moves "
+              f"({os.path.getsize(path)} bytes, {len(tree)} positions before pruning)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,64 +1,303 @@
 # Game controller logic
+import asyncio
+import threading
+import time
+from collections import deque, namedtuple
 from game.board import Board
 from game.rules import Rules
-from game.ai import AIPlayer
-from config.settings import BOARD_SIZE, WIN_LENGTH
+from game.ai import AIPlayer, SearchStopped
+from game import metrics
+from game.events import PiecePlaced, PieceRemoved, TurnChanged, GameWon, GameDrawn
+from game.seeding import spawn_rng
+from game.variants import get_variant
+from config.settings import REPETITION_DRAW_LIMIT, REPETITION_WINDOW, REPETITION_AVOID
+
+# Record move ringan (tuple tanpa __dict__), tetap bisa diakses move[0] / move.row
+Move = namedtuple("Move", "row col player")
+
 
 class GameController:
-    def __init__(self, game_mode="pvp", ai_difficulty="medium"):
-        self.board = Board(BOARD_SIZE)
-        self.rules = Rules(self.board, WIN_LENGTH)
+    def __init__(self, game_mode="pvp", ai_difficulty="medium", board_size=None, win_length=None,
+                 track_metrics=True, variant=None, seed=None, ai_sides=None):
+        # Aturan permainan (lihat game/variants.py); ukuran papan bisa di-override
+        variant = variant or get_variant()
+        if (board_size or variant.board_size, win_length or variant.win_length) != \
+                (variant.board_size, variant.win_length):
+            variant = variant.resized(board_size or variant.board_size, win_length or variant.win_length)
+        self.variant = variant
+        self.board = Board(variant.board_size, track_order=True)
+        self.rules = Rules(self.board, variant.win_length)
         self.current_player = "X"
         self.game_over = False
         self.move_history = []  # Simpan urutan move
+        self.ply = 0  # jumlah langkah yang sudah dimainkan (history bisa menyusut saat removal)
+        self.listeners = []  # callback event (lihat game/events.py); salinan tidak ikut
         self.game_mode = game_mode  # "pvp" atau "ai"
         self.ai_difficulty = ai_difficulty
-        self.ai_player = AIPlayer(self.board, ai_difficulty) if game_mode == "ai" else None
+        # Engine per simbol; mode "ai" default-nya manusia X lawan AI O, ai_sides bisa satu atau dua sisi
+        if ai_sides is None:
+            ai_sides = ("O",) if game_mode == "ai" else ()
+        self.ai_players = {}
+        self.ai_player = None  # engine utama (O bila ada) untuk ponder, analisis dan cache sesi
+
+        # Deteksi posisi berulang (mode infinite bisa berputar selamanya)
+        self.repetition_limit = REPETITION_DRAW_LIMIT
+        self.position_window = deque()  # hanya REPETITION_WINDOW posisi terakhir yang diingat
+        self.position_counts = {}
+        self._record_position()
+
+        # Salinan untuk ponder/analisis tidak ikut dihitung di metrics
+        self.track_metrics = track_metrics
+        for symbol in ai_sides:
+            self.set_ai_player(symbol, AIPlayer(
+                self.board, ai_difficulty, ai_symbol=symbol, win_length=variant.win_length,
+                variant=variant, rng=spawn_rng(seed, "ai", symbol),
+            ))
+        if track_metrics:
+            metrics.GAMES_STARTED.inc()
+            metrics.ACTIVE_GAMES.inc()
+
+    def copy(self):
+        """Independent copy of the game state; the AI shares its transposition table"""
+        clone = GameController(self.game_mode, self.ai_difficulty, track_metrics=False, variant=self.variant,
+                               ai_sides=())
+        clone.board = self.board.copy()
+        clone.rules = Rules(clone.board, self.rules.win_length)
+        clone.current_player = self.current_player
+        clone.game_over = self.game_over
+        clone.move_history = list(self.move_history)
+        clone.ply = self.ply
+        clone.repetition_limit = self.repetition_limit
+        clone.position_window = deque(self.position_window)
+        clone.position_counts = dict(self.position_counts)
+        for symbol, engine in self.ai_players.items():
+            clone.set_ai_player(symbol, engine.copy(clone.board))
+        return clone
+
+    def set_ai_player(self, symbol, engine):
+        """Let engine (an AIPlayer bound to self.board) play symbol"""
+        self.ai_players[symbol] = engine
+        self.ai_player = self.ai_players.get("O") or self.ai_players.get("X")
+        engine.track_metrics = self.track_metrics
+        if REPETITION_AVOID:
+            engine.repetition_after = self.repetitions_after
+
+    def is_ai_turn(self):
+        return not self.game_over and self.current_player in self.ai_players
 
     def make_move(self, row, col):
         if self.game_over:
             return None
 
-        if not self.board.is_empty(row, col):
+        if not self.variant.is_legal(self.board, row, col):
             return None
 
-        self.board.place(row, col, self.current_player)
-        self.move_history.append((row, col, self.current_player))
+        player = self.current_player
+        removed = False
+
+        # Varian max_pieces: angkat batu tertua pemain ini dulu
+        lift = self.variant.piece_to_lift(self.move_history, player)
+        if lift is not None:
+            self._remove_move(lift)
+            removed = True
 
-        if self.rules.check_win(row, col, self.current_player):
-            self.game_over = True
-            return f"{self.current_player} MENANG"
+        self.board.place(row, col, player)
+        self.move_history.append(Move(row, col, player))
+        self.ply += 1
+        if self.track_metrics:
+            metrics.MOVES.inc()
+
+        self._emit(PiecePlaced(row, col, player))
+
+        cells = self.rules.winning_cells(row, col, player)
+        if cells:
+            self._finish_game(metrics.GAMES_WON)
+            self._emit(GameWon(player, cells))
+            return f"{player} MENANG"
 
         # Cek apakah board penuh (draw)
         if self.is_board_full():
-            # Hapus move paling awal
-            self.remove_oldest_move()
-            # Ganti giliran pemain setelah removal
-            self.current_player = "O" if self.current_player == "X" else "X"
-            return "DRAW_REMOVE"  # Signal untuk GUI bahwa ada penghapusan
+            index = self.variant.piece_to_remove_when_full(self.move_history, player)
+            if index is None:
+                self._finish_game(metrics.GAMES_DRAWN)
+                self._emit(GameDrawn("full"))
+                return "DRAW_FULL"
+            # Hapus move sesuai varian (default: move paling awal)
+            self._remove_move(index)
+            removed = True
 
-        self.current_player = "O" if self.current_player == "X" else "X"
+        # Ganti giliran pemain (setelah removal)
+        self.current_player = "O" if player == "X" else "X"
+        repeated = self._is_repetition_draw()
+        self._emit(TurnChanged(self.current_player))
+        if repeated:
+            self._emit(GameDrawn("repeat"))
+            return "DRAW_REPEAT"
+        if removed:
+            return "DRAW_REMOVE"  # Signal untuk GUI bahwa ada penghapusan
         return None
 
     def ai_move(self):
-        """Execute AI move"""
-        if not self.ai_player or self.current_player != "O" or self.game_over:
+        """Execute AI move (blocking) for whichever side is to move"""
+        if not self.is_ai_turn():
             return None
         
-        move = self.ai_player.get_best_move()
+        move = self.ai_players[self.current_player].get_best_move()
         if move:
             row, col = move
             return self.make_move(row, col)
         return None
 
+    async def ai_move_async(self, executor=None, deadline=None):
+        """Execute AI move without blocking the event loop; same result as ai_move().
+
+        Engine berpikir di executor (default: thread pool milik loop) pada salinan papan,
+        jadi papan asli hanya diubah oleh make_move di thread loop. Lewat deadline (detik)
+        search dihentikan dan dipakai fallback_move(); engine.move_deadline (budget waktu
+        engine itu sendiri) berlaku juga, yang lebih ketat yang dipakai. Task yang di-cancel
+        menghentikan search-nya juga; posisi tidak berubah.
+        """
+        if not self.is_ai_turn():
+            return None
+
+        player = self.current_player
+        engine = self.ai_players[player]
+        if engine.move_deadline is not None:
+            deadline = engine.move_deadline if deadline is None else min(deadline, engine.move_deadline)
+        key = self.board.key(player)
+        # Stream acak engine ikut dipakai supaya hasil sama dengan ai_move()
+        worker = engine.copy(self.board.copy(), rng=engine.rng)
+        worker.track_metrics = engine.track_metrics
+        worker.repetition_after = engine.repetition_after
+        stop_event = threading.Event()
+        worker.stop_event = stop_event
+
+        start = time.perf_counter()
+        future = asyncio.get_running_loop().run_in_executor(executor, worker.get_best_move)
+        try:
+            move = await asyncio.wait_for(asyncio.shield(future), deadline)
+        except asyncio.TimeoutError:
+            stop_event.set()
+            stopped = False
+            try:
+                await future
+            except SearchStopped:
+                stopped = True
+            move = worker.fallback_move()
+            # Langkah fallback tetap langkah AI: catat waktu dinding sampai langkahnya siap
+            worker.last_move_seconds = time.perf_counter() - start
+            if stopped and engine.track_metrics:
+                metrics.AI_MOVE_SECONDS.observe(worker.last_move_seconds)
+        except asyncio.CancelledError:
+            stop_event.set()
+            # Tunggu thread search berhenti (dalam satu node) supaya tt bersama tidak lagi ditulis
+            await asyncio.wait([future])
+            if not future.cancelled():
+                future.exception()
+            raise
+        engine.last_move_seconds = worker.last_move_seconds
+
+        # Posisi berubah selama menunggu (mis. game di-reset): langkahnya sudah basi
+        if move is None or self.game_over or self.board.key(player) != key:
+            return None
+        return self.make_move(*move)
+
+    async def play_ai_turns(self, executor=None, deadline=None, max_moves=None, delay=0):
+        """Play consecutive AI moves until a human is to move or the game ends; returns the last result"""
+        result = None
+        moves = 0
+        while self.is_ai_turn() and (max_moves is None or moves < max_moves):
+            if delay:
+                await asyncio.sleep(delay)
+            ply = self.ply
+            result = await self.ai_move_async(executor, deadline)
+            if self.ply == ply:
+                break  # engine tidak punya langkah
+            moves += 1
+        return result
+
     def is_board_full(self):
-        for row in self.board.grid:
-            for cell in row:
-                if cell == "":
-                    return False
-        return True
+        return self.board.is_full()
 
     def remove_oldest_move(self):
         if self.move_history:
-            row, col, player = self.move_history.pop(0)
-            self.board.grid[row][col] = ""
+            self._remove_move(0)
+
+    def _remove_move(self, index):
+        row, col, player = self.move_history.pop(index)
+        self.board.clear(row, col)
+        if self.track_metrics:
+            metrics.REMOVALS.inc()
+        self._emit(PieceRemoved(row, col, player))
+
+    def add_listener(self, listener):
+        """Call listener(event) for every event (see game/events.py)"""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def _emit(self, event):
+        for listener in list(self.listeners):
+            listener(event)
+
+    def close(self):
+        """Game abandoned before it finished (e.g. New Game): no longer active"""
+        if self.track_metrics and not self.game_over:
+            metrics.ACTIVE_GAMES.dec()
+        self.track_metrics = False
+
+    def _finish_game(self, outcome):
+        self.game_over = True
+        if self.track_metrics:
+            metrics.ACTIVE_GAMES.dec()
+            outcome.inc()
+
+    def repetition_count(self, key):
+        """How many times a position key occurred within the repetition window"""
+        return self.position_counts.get(key, 0)
+
+    def key_after(self, row, col):
+        """Position key make_move(row, col) would record, including the variant's removals"""
+        player = self.current_player
+        history = list(self.move_history)
+        removed = []
+        lift = self.variant.piece_to_lift(history, player)
+        if lift is not None:
+            removed.append(history.pop(lift))
+        history.append(Move(row, col, player))
+        # Papan penuh setelah langkah ini: varian menghapus satu batu lagi
+        empty = self.board.size * self.board.size - self.board.stones - 1 + len(removed)
+        if not empty:
+            index = self.variant.piece_to_remove_when_full(history, player)
+            if index is not None:
+                removed.append(history[index])
+        next_player = "O" if player == "X" else "X"
+        return self.board.key_after(row, col, player, [(r, c) for r, c, _ in removed], next_player)
+
+    def repetitions_after(self, row, col):
+        """How often the position after current_player plays (row, col) already occurred"""
+        return self.repetition_count(self.key_after(row, col))
+
+    def _record_position(self):
+        key = self.board.key(self.current_player)
+        count = self.position_counts.get(key, 0) + 1
+        self.position_counts[key] = count
+        self.position_window.append(key)
+
+        if len(self.position_window) > REPETITION_WINDOW:
+            old_key = self.position_window.popleft()
+            remaining = self.position_counts[old_key] - 1
+            if remaining:
+                self.position_counts[old_key] = remaining
+            else:
+                del self.position_counts[old_key]
+        return count
+
+    def _is_repetition_draw(self):
+        count = self._record_position()
+        if self.repetition_limit and count >= self.repetition_limit:
+            self._finish_game(metrics.GAMES_DRAWN)
+            return True
+        return False
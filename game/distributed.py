@@ -0,0 +1,261 @@
+# Distributed self-play: a coordinator hands tournament games to workers over TCP
+#
+#     python -m game.distributed coordinator --port 5577 --games 50 --output games.jsonl --resume
+#     python -m game.distributed worker --host 10.0.0.2 --port 5577 --processes 8
+#     python -m game.distributed local --workers 4 --games 20      # semua di mesin ini
+#
+# Protokol: satu objek JSON per baris. Worker mengirim {"op": "get"} atau
+# {"op": "result", "record": ..., "metrics": ...}; coordinator selalu membalas dengan tugas berikutnya
+# ({"op": "job"}, {"op": "wait"} atau {"op": "done"}). Job sama dengan game/tournament.py
+# (nomor job + seed turunan), jadi hasilnya tidak bergantung pada worker yang memainkannya.
+#   work stealing : antrean kosong tapi masih ada job berjalan -> worker yang menganggur ikut
+#                   memainkan job milik worker lain; record pertama yang masuk yang dipakai
+#   checkpoint    : setiap record langsung ditambahkan ke file output; --resume melewati
+#                   job yang sudah tercatat dengan seed dan spesifikasi yang sama
+#   worker putus  : job yang sedang dipegangnya kembali ke depan antrean
+#   metrics       : worker mengirim diff registry-nya per record; coordinator menggabungkannya
+import argparse
+import json
+import multiprocessing
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+
+from game import metrics
+from game.tournament import load_records, match_records, play_job, report, schedule
+from game.variants import RuleVariant
+from config.settings import (
+    TOURNAMENT_ENGINES, TOURNAMENT_VARIANTS, TOURNAMENT_GAMES, TOURNAMENT_SEED, DISTRIBUTED_PORT
+)
+
+POLL_SECONDS = 0.2
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+    block_on_close = False
+
+
+class _WorkerHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        coordinator = self.server.coordinator
+        worker = coordinator.register()
+        try:
+            for line in self.rfile:
+                message = json.loads(line)
+                if message.get("op") == "result":
+                    coordinator.submit(message["record"], message.get("metrics"))
+                reply = coordinator.next_reply(worker)
+                self.wfile.write((json.dumps(reply) + "\n").encode())
+        except (OSError, ValueError, KeyError):
+            pass
+        finally:
+            coordinator.release(worker)
+
+
+class Coordinator:
+    """Hands out jobs, reassigns abandoned ones and merges results into one stream"""
+
+    def __init__(self, jobs, output=None, resume=False):
+        self.jobs = {
+            index: {"op": "job", "job": index, "x": x_spec, "o": o_spec,
+                    "variant": variant.to_dict(), "seed": seed}
+            for index, x_spec, o_spec, variant, seed in jobs
+        }
+        previous = load_records(output) if output and resume else []
+        if output and not resume:
+            open(output, "w").close()
+        # Record lama hanya dipakai kalau seed dan spesifikasinya sama dengan job terjadwal
+        self.records, self.stale = match_records(previous, jobs)
+        self.done = {r["job"] for r in self.records}
+        self.pending = deque(index for index in sorted(self.jobs) if index not in self.done)
+        self.leases = {}  # job -> id worker yang sedang memainkannya
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        if len(self.done) == len(self.jobs):
+            self.finished.set()
+        self.output = output
+        self._out = None
+        self._server = None
+        self._workers = 0
+
+    @classmethod
+    def for_tournament(cls, engines=TOURNAMENT_ENGINES, variants=TOURNAMENT_VARIANTS,
+                       games=TOURNAMENT_GAMES, seed=TOURNAMENT_SEED, output=None, resume=False):
+        return cls(schedule(engines, variants, games, seed), output, resume)
+
+    def register(self):
+        with self.lock:
+            self._workers += 1
+            return self._workers
+
+    def next_reply(self, worker):
+        """Next job for worker: queued first, otherwise steal one still running elsewhere"""
+        with self.lock:
+            if self.finished.is_set():
+                return {"op": "done"}
+            if self.pending:
+                index = self.pending.popleft()
+            else:
+                stealable = [j for j, holders in self.leases.items() if worker not in holders]
+                if not stealable:
+                    return {"op": "wait"}
+                # Job dengan pemegang paling sedikit, lalu yang paling lama berjalan
+                index = min(stealable, key=lambda j: (len(self.leases[j]), j))
+            self.leases.setdefault(index, set()).add(worker)
+            return self.jobs[index]
+
+    def submit(self, record, delta=None):
+        """Merge one finished game and its worker's metrics delta; duplicates from stolen jobs are dropped"""
+        with self.lock:
+            index = record["job"]
+            self.leases.pop(index, None)
+            if index in self.done or index not in self.jobs:
+                return
+            self.done.add(index)
+            self.records.append(record)
+            if delta:
+                metrics.REGISTRY.merge(delta)
+            if self._out:
+                self._out.write(json.dumps(record) + "\n")
+                self._out.flush()
+            if len(self.done) == len(self.jobs):
+                self.finished.set()
+
+    def release(self, worker):
+        """Worker disconnected: requeue jobs nobody else is playing"""
+        with self.lock:
+            for index, holders in list(self.leases.items()):
+                holders.discard(worker)
+                if not holders:
+                    del self.leases[index]
+                    if index not in self.done:
+                        self.pending.appendleft(index)
+
+    def start(self, host="0.0.0.0", port=DISTRIBUTED_PORT):
+        """Listen for workers on a daemon thread; returns the bound (host, port)"""
+        self._out = open(self.output, "a") if self.output else None
+        self._server = _Server((host, port), _WorkerHandler)
+        self._server.coordinator = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.server_address
+
+    def wait(self, timeout=None):
+        """Block until every job has a record; returns all records sorted by job"""
+        try:
+            self.finished.wait(timeout)
+        finally:
+            self._server.shutdown()
+            self._server.server_close()
+            if self._out:
+                self._out.close()
+        return sorted(self.records, key=lambda r: r["job"])
+
+
+def run_worker(host, port=DISTRIBUTED_PORT, connect_timeout=10.0):
+    """Play jobs from a coordinator until it reports done; returns games played"""
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(POLL_SECONDS)
+
+    played = 0
+    with sock, sock.makefile("rwb") as stream:
+        message = {"op": "get"}
+        while True:
+            try:
+                stream.write((json.dumps(message) + "\n").encode())
+                stream.flush()
+                line = stream.readline()
+            except OSError:
+                break
+            if not line:
+                break
+            reply = json.loads(line)
+            if reply["op"] == "done":
+                break
+            if reply["op"] == "wait":
+                time.sleep(POLL_SECONDS)
+                message = {"op": "get"}
+                continue
+            record, delta = play_job((reply["job"], reply["x"], reply["o"],
+                                      RuleVariant.from_dict(reply["variant"]), reply["seed"]))
+            played += 1
+            message = {"op": "result", "record": record, "metrics": delta}
+    return played
+
+
+def start_workers(host, port, processes):
+    """Start worker processes connected to one coordinator"""
+    workers = [multiprocessing.Process(target=run_worker, args=(host, port), daemon=True)
+               for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+def _report_stale(coordinator):
+    if coordinator.stale:
+        print(f"Resume: {len(coordinator.stale)} record(s) in {coordinator.output} do not match the "
+              "scheduled job (seed, engines or rules changed); those jobs are played again")
+
+
+def run_local(workers=2, games=TOURNAMENT_GAMES, seed=TOURNAMENT_SEED, output=None, resume=False):
+    """Coordinator plus worker processes on this machine, over loopback sockets"""
+    coordinator = Coordinator.for_tournament(games=games, seed=seed, output=output, resume=resume)
+    _report_stale(coordinator)
+    host, port = coordinator.start("127.0.0.1", 0)
+    processes = start_workers(host, port, workers)
+    records = coordinator.wait()
+    for process in processes:
+        process.join()
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed tournament self-play")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("coordinator", "local"):
+        command = commands.add_parser(name)
+        command.add_argument("--games", type=int, default=TOURNAMENT_GAMES, help="games per pairing")
+        command.add_argument("--seed", type=int, default=TOURNAMENT_SEED, help="master seed")
+        command.add_argument("--output", help="merged game records (JSON lines)")
+        command.add_argument("--resume", action="store_true", help="skip jobs already in --output")
+    commands.choices["coordinator"].add_argument("--host", default="0.0.0.0")
+    commands.choices["coordinator"].add_argument("--port", type=int, default=DISTRIBUTED_PORT)
+    commands.choices["local"].add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+
+    worker = commands.add_parser("worker")
+    worker.add_argument("--host", default="127.0.0.1")
+    worker.add_argument("--port", type=int, default=DISTRIBUTED_PORT)
+    worker.add_argument("--processes", type=int, default=multiprocessing.cpu_count())
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        for process in start_workers(args.host, args.port, args.processes):
+            process.join()
+        return
+
+    if args.command == "local":
+        records = run_local(args.workers, args.games, args.seed, args.output, args.resume)
+    else:
+        coordinator = Coordinator.for_tournament(games=args.games, seed=args.seed,
+                                                 output=args.output, resume=args.resume)
+        _report_stale(coordinator)
+        host, port = coordinator.start(args.host, args.port)
+        print(f"Coordinator listening on {host}:{port} ({len(coordinator.pending)} jobs)")
+        records = coordinator.wait()
+    report(records)
+
+
+if __name__ == "__main__":
+    main()
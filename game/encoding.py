@@ -0,0 +1,98 @@
+# Packed search-result and game-archive encodings
+#
+#     python -m game.encoding --positions 100000
+#
+# Skor TT: (skor << bit_langkah) | indeks sel, satu int per langkah; bit_langkah cukup
+#          untuk size*size sel, jadi papan sebesar apa pun tidak tumpang tindih dengan skor
+# Arsip  : satu byte per langkah (dua byte kalau papan lebih dari 256 sel)
+import argparse
+import random
+import tracemalloc
+
+
+def _move_bits(size):
+    return max(1, (size * size - 1).bit_length())
+
+
+def pack_scores(scores, size):
+    """[((row, col), score), ...] -> tuple of ints"""
+    bits = _move_bits(size)
+    return tuple((score << bits) | (row * size + col) for (row, col), score in scores)
+
+
+def unpack_scores(packed, size):
+    bits = _move_bits(size)
+    mask = (1 << bits) - 1
+    return [(divmod(value & mask, size), value >> bits) for value in packed]
+
+
+def pack_moves(moves, size):
+    """Game archive: [(row, col, player), ...] -> bytes (one cell index per move, players alternate)"""
+    width = 1 if size * size <= 256 else 2
+    return b"".join((row * size + col).to_bytes(width, "little") for row, col, _ in moves)
+
+
+def unpack_moves(data, size, first_player="X"):
+    width = 1 if size * size <= 256 else 2
+    player = first_player
+    moves = []
+    for i in range(0, len(data), width):
+        row, col = divmod(int.from_bytes(data[i:i + width], "little"), size)
+        moves.append((row, col, player))
+        player = "O" if player == "X" else "X"
+    return moves
+
+
+def _measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    data = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, data
+
+
+def benchmark(positions=100000, size=3, seed=0):
+    """Bytes per entry for transposition tables and game archives, plain vs packed"""
+    from game.board import Board
+
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(positions):
+        board = Board(size)
+        for idx in rng.sample(range(size * size), rng.randint(1, size * size - 1)):
+            board.place(idx // size, idx % size, rng.choice("XO"))
+        boards.append(board)
+    scores = [[((r, c), rng.randint(-100, 100)) for r in range(size) for c in range(size)][:5]
+              for _ in range(positions)]
+
+    results = {}
+    results["tt plain (grid tuple -> list of tuples)"] = _measure(lambda: {
+        tuple(map(tuple, b.grid)): list(s) for b, s in zip(boards, scores)
+    })[0]
+    results["tt packed (zobrist int -> tuple of ints)"] = _measure(lambda: {
+        b.key(): pack_scores(s, size) for b, s in zip(boards, scores)
+    })[0]
+
+    games = [[(rng.randrange(size), rng.randrange(size), "XO"[i % 2]) for i in range(30)]
+             for _ in range(positions // 10)]
+    results["archive plain (30-move game, list of tuples)"] = _measure(
+        lambda: [list(g) for g in games])[0] * 10
+    results["archive packed (30-move game, bytes)"] = _measure(
+        lambda: [pack_moves(g, size) for g in games])[0] * 10
+
+    return {name: total / positions for name, total in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory per position: plain vs packed encodings")
+    parser.add_argument("--positions", type=int, default=100000)
+    parser.add_argument("--size", type=int, default=3)
+    args = parser.parse_args()
+
+    for name, per_entry in benchmark(args.positions, args.size).items():
+        print(f"{name:<48}{per_entry:>10.1f} bytes")
+
+
+if __name__ == "__main__":
+    main()
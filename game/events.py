@@ -0,0 +1,14 @@
+# Typed events emitted by GameController to registered listeners
+#
+# Listener dipanggil sinkron di dalam make_move, urut sesuai kejadian:
+#   PieceRemoved (batu diangkat, max_pieces) -> PiecePlaced -> GameWon
+#   atau  ... -> PiecePlaced -> [GameDrawn("full") | PieceRemoved] -> TurnChanged -> [GameDrawn("repeat")]
+# Setiap event membawa sel yang berubah, jadi listener (GUI, recorder, server) cukup
+# memperbarui sel itu saja tanpa membaca ulang seluruh papan.
+from collections import namedtuple
+
+PiecePlaced = namedtuple("PiecePlaced", "row col player")
+PieceRemoved = namedtuple("PieceRemoved", "row col player")
+TurnChanged = namedtuple("TurnChanged", "player")
+GameWon = namedtuple("GameWon", "player cells")  # cells: sel baris pemenang [(row, col), ...]
+GameDrawn = namedtuple("GameDrawn", "reason")    # "full" atau "repeat"
@@ -0,0 +1,221 @@
+# Learned evaluation function trained from self-play (pure NumPy, CPU only)
+#
+#     python -m game.learn --games 2000 --size 3 --win 3 --hidden 16 --output evaluator.json
+#
+# Fitur tidak bergantung ukuran papan: untuk level j = 1..FEATURE_LEVELS, hitung
+# proporsi window yang berisi K-j batu sendiri (tanpa batu lawan), lalu hal yang
+# sama untuk lawan. Model: regresi logistik (hidden=0) atau MLP kecil satu layer.
+import argparse
+import json
+import random
+
+try:
+    import numpy as np
+except ImportError:  # numpy opsional; hanya dibutuhkan untuk evaluator hasil training
+    np = None
+
+from game.rules import get_tables
+from game.seeding import spawn_rng
+
+FEATURE_LEVELS = 4
+NUM_FEATURES = 2 * FEATURE_LEVELS
+
+_EVALUATOR_CACHE = {}
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The learned evaluator requires numpy (pip install numpy)")
+
+
+def features(board, win_length, player):
+    """Line-pattern feature vector of board from player's point of view"""
+    windows = get_tables(board.size, win_length)[0]
+    grid = board.grid
+    size = board.size
+    values = [0.0] * NUM_FEATURES
+
+    for window in windows:
+        own = other = 0
+        for idx in window:
+            cell = grid[idx // size][idx % size]
+            if cell == player:
+                own += 1
+            elif cell:
+                other += 1
+        if own and not other:
+            level = win_length - own
+            if 1 <= level <= FEATURE_LEVELS:
+                values[level - 1] += 1
+        elif other and not own:
+            level = win_length - other
+            if 1 <= level <= FEATURE_LEVELS:
+                values[FEATURE_LEVELS + level - 1] += 1
+
+    if windows:
+        values = [v / len(windows) for v in values]
+    return values
+
+
+class Evaluator:
+    """Predicts the probability that player wins from the feature vector"""
+
+    def __init__(self, hidden=0, seed=0):
+        _require_numpy()
+        rng = np.random.default_rng(seed)
+        self.hidden = hidden
+        if hidden:
+            self.w1 = rng.normal(0, 0.5, (NUM_FEATURES, hidden))
+            self.b1 = np.zeros(hidden)
+            self.w2 = rng.normal(0, 0.5, hidden)
+        else:
+            self.w1 = self.b1 = None
+            self.w2 = np.zeros(NUM_FEATURES)
+        self.b2 = 0.0
+
+    def _forward(self, x):
+        if self.hidden:
+            h = np.tanh(x @ self.w1 + self.b1)
+            return h, 1 / (1 + np.exp(-(h @ self.w2 + self.b2)))
+        return x, 1 / (1 + np.exp(-(x @ self.w2 + self.b2)))
+
+    def evaluate_batch(self, rows):
+        """Win probabilities for a batch of feature vectors"""
+        x = np.asarray(rows, dtype=float).reshape(-1, NUM_FEATURES)
+        return self._forward(x)[1]
+
+    def evaluate(self, board, win_length, player):
+        return float(self.evaluate_batch([features(board, win_length, player)])[0])
+
+    def train(self, x, y, epochs=300, learning_rate=0.05):
+        """Full-batch Adam on binary cross-entropy; returns the final loss"""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        params = ["w2", "b2"] + (["w1", "b1"] if self.hidden else [])
+        moments = {name: (np.zeros_like(getattr(self, name)), np.zeros_like(getattr(self, name)))
+                   for name in params}
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        loss = 0.0
+
+        for step in range(1, epochs + 1):
+            h, p = self._forward(x)
+            p = np.clip(p, 1e-7, 1 - 1e-7)
+            loss = float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p)))
+
+            grad_out = (p - y) / len(y)
+            grads = {"w2": h.T @ grad_out, "b2": grad_out.sum()}
+            if self.hidden:
+                grad_h = np.outer(grad_out, self.w2) * (1 - h ** 2)
+                grads["w1"] = x.T @ grad_h
+                grads["b1"] = grad_h.sum(axis=0)
+
+            for name in params:
+                m, v = moments[name]
+                m = beta1 * m + (1 - beta1) * grads[name]
+                v = beta2 * v + (1 - beta2) * grads[name] ** 2
+                moments[name] = (m, v)
+                update = learning_rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + eps)
+                setattr(self, name, getattr(self, name) - update)
+        return loss
+
+    def save(self, path):
+        data = {"hidden": self.hidden, "w2": np.asarray(self.w2).tolist(), "b2": float(self.b2)}
+        if self.hidden:
+            data["w1"] = self.w1.tolist()
+            data["b1"] = self.b1.tolist()
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        evaluator = cls(hidden=data["hidden"])
+        evaluator.w2 = np.asarray(data["w2"], dtype=float)
+        evaluator.b2 = float(data["b2"])
+        if evaluator.hidden:
+            evaluator.w1 = np.asarray(data["w1"], dtype=float)
+            evaluator.b1 = np.asarray(data["b1"], dtype=float)
+        return evaluator
+
+
+def load_evaluator(path):
+    """Load (and cache) a trained evaluator"""
+    if path not in _EVALUATOR_CACHE:
+        _EVALUATOR_CACHE[path] = Evaluator.load(path)
+    return _EVALUATOR_CACHE[path]
+
+
+def self_play(board_size, win_length, difficulty="medium", epsilon=0.2, max_moves=100, seed=None,
+              variant=None):
+    """Play one game and return [(features, mover)], winner ("X", "O" or None)"""
+    from game.ai import AIPlayer
+    from game.controller import GameController
+
+    rng = random.Random(seed)
+    controller = GameController(board_size=board_size, win_length=win_length, variant=variant)
+    engines = {
+        symbol: AIPlayer(controller.board, difficulty, ai_symbol=symbol, win_length=win_length,
+                         variant=controller.variant, rng=spawn_rng(seed, symbol))
+        for symbol in ("X", "O")
+    }
+
+    samples = []
+    result = None
+    for _ in range(max_moves):
+        if controller.game_over:
+            break
+        player = controller.current_player
+        move = None
+        if rng.random() >= epsilon:
+            move = engines[player].get_best_move()
+        if move is None:
+            empty = engines[player]._get_available_moves()
+            if not empty:
+                break
+            move = rng.choice(empty)
+        result = controller.make_move(*move)
+        if not controller.game_over:
+            samples.append((features(controller.board, win_length, player), player))
+
+    controller.close()
+    winner = None
+    if controller.game_over and result not in (None, "DRAW_REMOVE", "DRAW_REPEAT", "DRAW_FULL"):
+        winner = result.split()[0]
+    return samples, winner
+
+
+def build_dataset(games, board_size, win_length, difficulty="medium", epsilon=0.2, seed=0):
+    """Self-play games -> (X features, y outcome for the player who just moved)"""
+    x, y = [], []
+    for game in range(games):
+        samples, winner = self_play(board_size, win_length, difficulty, epsilon, seed=seed + game)
+        for row, mover in samples:
+            x.append(row)
+            y.append(0.5 if winner is None else float(winner == mover))
+    return x, y
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a learned evaluator from self-play")
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--win", type=int, default=3)
+    parser.add_argument("--difficulty", default="medium", help="engine used for self-play")
+    parser.add_argument("--epsilon", type=float, default=0.2, help="chance of a random move")
+    parser.add_argument("--hidden", type=int, default=0, help="hidden units (0 = linear)")
+    parser.add_argument("--epochs", type=int, default=300)
+    parser.add_argument("--output", default="evaluator.json")
+    parser.add_argument("--seed", type=int, default=0, help="self-play seed (same seed = same dataset)")
+    args = parser.parse_args()
+
+    _require_numpy()
+    x, y = build_dataset(args.games, args.size, args.win, args.difficulty, args.epsilon, args.seed)
+    evaluator = Evaluator(hidden=args.hidden)
+    loss = evaluator.train(x, y, epochs=args.epochs)
+    evaluator.save(args.output)
+    print(f"{len(x)} positions, loss {loss:.4f} -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+# Lightweight metrics for server and simulation workloads
+#
+# Counter/Gauge/Histogram sederhana tanpa dependency. Di hot path hanya ada
+# penambahan angka; format Prometheus / JSON baru dibuat saat diekspor.
+# Registry per proses: worker (process pool, self-play) mengirim diff() bersama setiap
+# record, dan proses induk menggabungkannya dengan merge().
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def samples(self):
+        return [(self.name, self.value)]
+
+
+class Gauge(Counter):
+    def dec(self, amount=1):
+        self.value -= amount
+
+    def set(self, value):
+        self.value = value
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help = help_text
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # slot terakhir = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self):
+        result = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            result.append((f'{self.name}_bucket{{le="{bound}"}}', cumulative))
+        result.append((f'{self.name}_bucket{{le="+Inf"}}', self.count))
+        result.append((f"{self.name}_sum", self.sum))
+        result.append((f"{self.name}_count", self.count))
+        return result
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text):
+        return self._add(Counter(name, help_text))
+
+    def gauge(self, name, help_text):
+        return self._add(Gauge(name, help_text))
+
+    def histogram(self, name, help_text, buckets):
+        return self._add(Histogram(name, help_text, buckets))
+
+    def render_prometheus(self):
+        """Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics:
+            kind = type(metric).__name__.lower()
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {kind}")
+            for name, value in metric.samples():
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """Raw values by metric name, for diff() / merge()"""
+        data = {}
+        for metric in self.metrics:
+            if isinstance(metric, Histogram):
+                data[metric.name] = {"counts": list(metric.counts), "sum": metric.sum, "count": metric.count}
+            else:
+                data[metric.name] = metric.value
+        return data
+
+    def diff(self, before):
+        """What changed since an earlier snapshot() (JSON-serializable)"""
+        delta = {}
+        for name, value in self.snapshot().items():
+            old = before[name]
+            if isinstance(value, dict):
+                if value["count"] != old["count"]:
+                    delta[name] = {
+                        "counts": [a - b for a, b in zip(value["counts"], old["counts"])],
+                        "sum": value["sum"] - old["sum"],
+                        "count": value["count"] - old["count"],
+                    }
+            elif value != old:
+                delta[name] = value - old
+        return delta
+
+    def merge(self, delta):
+        """Add a diff() made in another process (tournament / self-play worker)"""
+        by_name = {metric.name: metric for metric in self.metrics}
+        for name, value in delta.items():
+            metric = by_name.get(name)
+            if metric is None:
+                continue
+            if isinstance(metric, Histogram):
+                metric.counts = [a + b for a, b in zip(metric.counts, value["counts"])]
+                metric.sum += value["sum"]
+                metric.count += value["count"]
+            else:
+                metric.value += value
+
+    def to_dict(self):
+        data = {"timestamp": time.time()}
+        for metric in self.metrics:
+            if isinstance(metric, Histogram):
+                data[metric.name] = {
+                    "buckets": dict(zip(map(str, metric.buckets + ["+Inf"]), metric.counts)),
+                    "sum": metric.sum,
+                    "count": metric.count,
+                }
+            else:
+                data[metric.name] = metric.value
+        lookups = AI_CACHE_LOOKUPS.value
+        data["ai_cache_hit_ratio"] = AI_CACHE_HITS.value / lookups if lookups else 0.0
+        return data
+
+
+REGISTRY = Registry()
+
+MOVES = REGISTRY.counter("tictactoe_moves_total", "Moves placed on the board")
+REMOVALS = REGISTRY.counter("tictactoe_removals_total", "Pieces removed by the rule variant (e.g. oldest move in infinite mode)")
+GAMES_STARTED = REGISTRY.counter("tictactoe_games_started_total", "Games created")
+GAMES_WON = REGISTRY.counter("tictactoe_games_won_total", "Games ended with a winner")
+GAMES_DRAWN = REGISTRY.counter("tictactoe_games_drawn_total", "Games ended in a draw (full board or repetition)")
+ACTIVE_GAMES = REGISTRY.gauge("tictactoe_active_games", "Games started and not yet finished or closed")
+AI_MOVE_SECONDS = REGISTRY.histogram(
+    "tictactoe_ai_move_seconds", "Time spent choosing an AI move",
+    [0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5],
+)
+AI_CACHE_LOOKUPS = REGISTRY.counter("tictactoe_ai_cache_lookups_total", "AI transposition table lookups")
+AI_CACHE_HITS = REGISTRY.counter("tictactoe_ai_cache_hits_total", "AI transposition table hits")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port, host="127.0.0.1"):
+    """Expose /metrics on a daemon thread; returns the server (call shutdown() to stop)"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_json_dump(path, interval=10.0):
+    """Write a JSON snapshot every interval seconds; returns an Event that stops it"""
+    stop_event = threading.Event()
+
+    def run():
+        while not stop_event.wait(interval):
+            tmp = path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(REGISTRY.to_dict(), f)
+            os.replace(tmp, path)
+
+    threading.Thread(target=run, daemon=True).start()
+    return stop_event
@@ -0,0 +1,198 @@
+# Precomputed move policy for medium difficulty
+#
+# Tabel dibuat offline dari engine hard, satu per (ukuran papan, K):
+#     python -m game.policy
+# Posisi tabel tidak punya urutan pemasangan, jadi skornya memakai aturan klasik (papan
+# penuh = seri). Tabel yang sama dipakai semua varian kecuali gravity (simetri 8 arah
+# tidak berlaku di sana); medium hanya butuh urutan langkah yang masuk akal, aturan
+# penghapusan tetap ditangani search hard.
+# Kunci tabel adalah posisi kanonik (8 simetri papan dilipat) dari sudut pandang
+# pemain yang jalan: "1" = pemain yang jalan, "2" = lawan, "0" = kosong.
+import json
+import math
+import os
+import random
+
+from game.board import Board
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Cache transformasi simetri per ukuran papan dan policy yang sudah dimuat
+_SYMMETRY_CACHE = {}
+_POLICY_CACHE = {}
+
+
+def symmetries(size):
+    """Return the 8 square symmetries as lists mapping new flat index -> old flat index"""
+    perms = _SYMMETRY_CACHE.get(size)
+    if perms is None:
+        n = size - 1
+        transforms = [
+            lambda r, c: (r, c),
+            lambda r, c: (c, n - r),
+            lambda r, c: (n - r, n - c),
+            lambda r, c: (n - c, r),
+            lambda r, c: (r, n - c),
+            lambda r, c: (n - r, c),
+            lambda r, c: (c, r),
+            lambda r, c: (n - c, n - r),
+        ]
+        perms = []
+        for transform in transforms:
+            perm = [0] * (size * size)
+            for r in range(size):
+                for c in range(size):
+                    tr, tc = transform(r, c)
+                    perm[tr * size + tc] = r * size + c
+            perms.append(perm)
+        _SYMMETRY_CACHE[size] = perms
+    return perms
+
+
+def encode(board, mover):
+    """Flat digit string of the board from the mover's point of view"""
+    digits = []
+    for row in board.grid:
+        for cell in row:
+            if cell == "":
+                digits.append("0")
+            elif cell == mover:
+                digits.append("1")
+            else:
+                digits.append("2")
+    return "".join(digits)
+
+
+def canonical(board, mover):
+    """Return (canonical key, perm) where perm maps canonical index -> board index"""
+    code = encode(board, mover)
+    best_key, best_perm = None, None
+    for perm in symmetries(board.size):
+        key = "".join(code[i] for i in perm)
+        if best_key is None or key < best_key:
+            best_key, best_perm = key, perm
+    return best_key, best_perm
+
+
+def policy_path(size, win_length):
+    return os.path.join(DATA_DIR, f"policy_{size}x{size}_k{win_length}.json")
+
+
+class Policy:
+    def __init__(self, size, win_length, positions):
+        self.size = size
+        self.win_length = win_length
+        self.positions = positions  # kunci kanonik -> [[indeks, skor], ...] urut skor menurun
+
+    def ranked_moves(self, board, mover):
+        """Ranked [(row, col, score), ...] for the position, or None if not in the table"""
+        key, perm = canonical(board, mover)
+        entries = self.positions.get(key)
+        if entries is None:
+            return None
+        return [(perm[idx] // self.size, perm[idx] % self.size, score) for idx, score in entries]
+
+    def choose(self, board, mover, temperature=0.0, rng=random):
+        """Pick a move: greedy at temperature 0, softmax over scores otherwise"""
+        moves = self.ranked_moves(board, mover)
+        if not moves:
+            return None
+        if temperature <= 0:
+            return moves[0][0], moves[0][1]
+
+        best = moves[0][2]
+        weights = [math.exp((score - best) / temperature) for _, _, score in moves]
+        pick = rng.random() * sum(weights)
+        for (row, col, _), weight in zip(moves, weights):
+            pick -= weight
+            if pick <= 0:
+                return row, col
+        return moves[-1][0], moves[-1][1]
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = {"size": self.size, "win_length": self.win_length, "positions": self.positions}
+        with open(path, "w") as f:
+            json.dump(data, f, separators=(",", ":"), sort_keys=True)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["size"], data["win_length"], data["positions"])
+
+
+def load_policy(size, win_length):
+    """Load (and cache) the policy for a board configuration, or None if not generated"""
+    key = (size, win_length)
+    if key not in _POLICY_CACHE:
+        path = policy_path(size, win_length)
+        _POLICY_CACHE[key] = Policy.load(path) if os.path.exists(path) else None
+    return _POLICY_CACHE[key]
+
+
+def _positions(size, code=""):
+    """Yield every non-terminal digit string with |mover - opponent| <= 1"""
+    if len(code) == size * size:
+        own, opp = code.count("1"), code.count("2")
+        if "0" in code and abs(own - opp) <= 1:
+            yield code
+        return
+    for digit in "012":
+        yield from _positions(size, code + digit)
+
+
+def generate_policy(size=3, win_length=3):
+    """Score every canonical position with the hard engine (run offline)"""
+    from game.ai import AIPlayer
+    from game.rules import Rules
+    from game.variants import get_variant
+
+    board = Board(size)
+    rules = Rules(board, win_length)
+    mover, other = "O", "X"
+    # Posisi tanpa riwayat: aturan klasik, apa pun RULE_VARIANT-nya
+    variant = get_variant("classic").resized(size, win_length)
+    engine = AIPlayer(board, "hard", ai_symbol=mover, win_length=win_length, variant=variant)
+
+    positions = {}
+    for code in _positions(size):
+        x_mask = o_mask = 0
+        for idx, digit in enumerate(code):
+            if digit == "1":
+                o_mask |= 1 << idx
+            elif digit == "2":
+                x_mask |= 1 << idx
+        if rules.winner_from_masks(x_mask, o_mask):
+            continue
+
+        for idx, digit in enumerate(code):
+            board.place(idx // size, idx % size, {"0": "", "1": mover, "2": other}[digit])
+        key, _ = canonical(board, mover)
+        if key not in positions:
+            entries = []
+            for row, col in engine._get_available_moves():
+                board.place(row, col, mover)
+                score = engine._minimax(0, False)
+                board.clear(row, col)
+                entries.append([row * size + col, score])
+            # Simpan dalam orientasi kanonik
+            _, perm = canonical(board, mover)
+            inverse = {old: new for new, old in enumerate(perm)}
+            entries = [[inverse[idx], score] for idx, score in entries]
+            entries.sort(key=lambda e: (-e[1], e[0]))
+            positions[key] = entries
+
+        for idx in range(size * size):
+            board.clear(idx // size, idx % size)
+
+    return Policy(size, win_length, positions)
+
+
+if __name__ == "__main__":
+    from config.settings import BOARD_SIZE, WIN_LENGTH
+
+    policy = generate_policy(BOARD_SIZE, WIN_LENGTH)
+    path = policy_path(BOARD_SIZE, WIN_LENGTH)
+    policy.save(path)
+    print(f"{len(policy.positions)} positions -> {path}")
@@ -0,0 +1,66 @@
+# Pondering: AI search on the opponent's time
+#
+# Selama giliran pemain, thread latar belakang mencoba balasan pemain yang
+# paling mungkin (diurutkan skor ancaman) pada salinan game, lalu menghitung
+# jawaban AI. Hasilnya masuk ke transposition table yang sama dengan AI asli,
+# sehingga saat pemain benar-benar jalan, balasan AI bisa langsung diambil.
+import threading
+
+from game.ai import SearchStopped
+from config.settings import SEARCH_STOP_TIMEOUT
+
+
+class Ponderer:
+    def __init__(self, controller):
+        self.controller = controller
+        self._stop_event = None
+        self._thread = None
+
+    def start(self):
+        """Start pondering the current position (player to move)"""
+        self.stop()
+        ai = self.controller.ai_player
+        if not ai or ai.difficulty != "hard" or self.controller.game_over:
+            return
+        if self.controller.current_player == ai.ai_symbol:
+            return
+
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(self.controller.copy(), self._stop_event),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop pondering and wait for the thread, so it no longer writes to the shared table"""
+        if self._stop_event:
+            self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(SEARCH_STOP_TIMEOUT)
+        self._stop_event = None
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self, snapshot, stop_event):
+        ai = snapshot.ai_player
+        human = ai.human_symbol
+        replies = ai._get_available_moves()
+        replies.sort(key=lambda move: -ai.threats.move_score(move[0], move[1], human))
+
+        for row, col in replies:
+            if stop_event.is_set():
+                return
+            game = snapshot.copy()
+            game.make_move(row, col)
+            if game.game_over or game.current_player != ai.ai_symbol:
+                continue
+            game.ai_player.stop_event = stop_event
+            try:
+                # Hasil disimpan di transposition table bersama
+                game.ai_player.get_best_move()
+            except SearchStopped:
+                return
@@ -1,37 +1,138 @@
 # Win rules and logic
+
+# Tabel garis menang di-cache per (size, win_length) supaya tidak dihitung ulang setiap game
+_TABLE_CACHE = {}
+
+
+def _build_tables(size, win_length):
+    """Precompute every K-window on an NxN board as flat indices and bitmasks"""
+    directions = [
+        (1, 0),    # vertical
+        (0, 1),    # horizontal
+        (1, 1),    # diagonal \
+        (1, -1)    # diagonal /
+    ]
+
+    windows = []
+    for row in range(size):
+        for col in range(size):
+            for dr, dc in directions:
+                end_r = row + dr * (win_length - 1)
+                end_c = col + dc * (win_length - 1)
+                if not (0 <= end_r < size and 0 <= end_c < size):
+                    continue
+                windows.append(tuple(
+                    (row + dr * i) * size + (col + dc * i)
+                    for i in range(win_length)
+                ))
+
+    masks = []
+    for window in windows:
+        mask = 0
+        for idx in window:
+            mask |= 1 << idx
+        masks.append(mask)
+
+    # Per sel: indeks semua window yang melewati sel tersebut
+    cell_windows = [[] for _ in range(size * size)]
+    for w, window in enumerate(windows):
+        for idx in window:
+            cell_windows[idx].append(w)
+
+    return windows, masks, [tuple(ws) for ws in cell_windows]
+
+
+def get_tables(size, win_length):
+    """Return cached (windows, masks, cell_windows) for a board configuration"""
+    key = (size, win_length)
+    tables = _TABLE_CACHE.get(key)
+    if tables is None:
+        tables = _build_tables(size, win_length)
+        _TABLE_CACHE[key] = tables
+    return tables
+
+
 class Rules:
     def __init__(self, board, win_length):
         self.board = board
         self.win_length = win_length
+        self.windows, self.masks, self.cell_windows = get_tables(board.size, win_length)
 
     def check_win(self, row, col, player):
-        directions = [
-            (1, 0),    # vertical
-            (0, 1),    # horizontal
-            (1, 1),    # diagonal \
-            (1, -1)    # diagonal /
-        ]
-
-        for dr, dc in directions:
-            count = 1
-            count += self._count_direction(row, col, dr, dc, player)
-            count += self._count_direction(row, col, -dr, -dc, player)
-
-            if count >= self.win_length:
+        """Check only the precomputed windows passing through (row, col)"""
+        grid = self.board.grid
+        size = self.board.size
+
+        for w in self.cell_windows[row * size + col]:
+            for idx in self.windows[w]:
+                if grid[idx // size][idx % size] != player:
+                    break
+            else:
                 return True
 
         return False
 
-    def _count_direction(self, row, col, dr, dc, player):
-        r, c = row + dr, col + dc
-        count = 0
+    def winning_cells(self, row, col, player):
+        """Cells [(row, col), ...] of a completed window through (row, col), or []"""
+        grid = self.board.grid
+        size = self.board.size
 
-        while 0 <= r < self.board.size and 0 <= c < self.board.size:
-            if self.board.get(r, c) == player:
-                count += 1
-                r += dr
-                c += dc
-            else:
+        for w in self.cell_windows[row * size + col]:
+            window = self.windows[w]
+            if all(grid[idx // size][idx % size] == player for idx in window):
+                return [divmod(idx, size) for idx in window]
+        return []
+
+    def winner_from_masks(self, x_mask, o_mask):
+        """Return "X", "O" or None for a pair of occupancy bitmasks"""
+        for mask in self.masks:
+            if x_mask & mask == mask:
+                return "X"
+            if o_mask & mask == mask:
+                return "O"
+        return None
+
+    def check_win_batch(self, boards):
+        """Winner ("X", "O" or None) of each board of this size, same as winner_from_masks
+
+        Bit-sliced: per cell one integer whose bit b is set when board b has the player
+        there, so each window is K ANDs over the whole batch instead of one test per board.
+        """
+        for board in boards:
+            if board.size != self.board.size:
+                raise ValueError(f"Board size {board.size} does not match rules for size {self.board.size}")
+        grids = [[cell for row in board.grid for cell in row] for board in boards]
+        if not grids:
+            return []
+        # Board terakhir di bit tertinggi: string biner dibaca dari board terakhir ke pertama
+        reverse = grids[::-1]
+
+        def slices(player):
+            return [int("".join("1" if grid[idx] == player else "0" for grid in reverse), 2)
+                    for idx in range(len(grids[0]))]
+
+        x_cells, o_cells = slices("X"), slices("O")
+        undecided = (1 << len(grids)) - 1
+        x_wins = o_wins = 0
+        # Urutan window sama dengan winner_from_masks: window pertama yang lengkap menentukan
+        for window in self.windows:
+            x_line = o_line = undecided
+            for idx in window:
+                x_line &= x_cells[idx]
+                o_line &= o_cells[idx]
+            o_line &= ~x_line
+            x_wins |= x_line
+            o_wins |= o_line
+            undecided &= ~(x_line | o_line)
+            if not undecided:
                 break
 
-        return count
+        results = []
+        for b in range(len(grids)):
+            if x_wins >> b & 1:
+                results.append("X")
+            elif o_wins >> b & 1:
+                results.append("O")
+            else:
+                results.append(None)
+        return results
@@ -0,0 +1,21 @@
+# Reproducible random streams for engines, games and workers
+#
+# Setiap engine mendapat random.Random sendiri (bukan modul random global), dengan seed
+# yang diturunkan dari seed utama + label lewat SHA-256. Turunan ini stabil lintas proses
+# dan versi Python (tidak seperti hash() untuk string), jadi hasil run paralel tidak
+# bergantung pada jumlah worker, urutan job, atau apakah run dilanjutkan dari tengah.
+import hashlib
+import random
+
+
+def derive_seed(seed, *labels):
+    """64-bit seed for the stream named by labels under a master seed"""
+    text = "/".join(map(str, (seed,) + labels))
+    return int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+
+
+def spawn_rng(seed, *labels):
+    """Independent random.Random for labels; seed None gives an unseeded stream"""
+    if seed is None:
+        return random.Random()
+    return random.Random(derive_seed(seed, *labels))
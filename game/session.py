@@ -0,0 +1,210 @@
+# Session persistence: snapshot + append-on-move log
+#
+# Format file (JSON lines):
+#   baris 1   : snapshot lengkap (mode, difficulty, ukuran papan, history, giliran, ...)
+#   baris 2.. : satu baris per move {"row": r, "col": c}
+# Resume = bangun ulang dari snapshot lalu replay move lewat GameController.make_move,
+# jadi penghapusan move tertua (mode infinite) dan deteksi repetisi ikut terulang persis.
+import json
+import os
+import queue
+import threading
+from collections import deque
+
+from game import metrics
+from game.controller import GameController, Move
+from game.encoding import pack_scores, unpack_scores
+from game.events import PiecePlaced, TurnChanged
+from game.variants import RuleVariant
+
+SESSION_VERSION = 1
+
+
+def snapshot(controller):
+    """Full game state as a JSON-serializable dict"""
+    return {
+        "version": SESSION_VERSION,
+        "mode": controller.game_mode,
+        "difficulty": controller.ai_difficulty,
+        "ai_sides": sorted(controller.ai_players),
+        "board_size": controller.board.size,
+        "win_length": controller.rules.win_length,
+        "variant": controller.variant.to_dict(),
+        "current_player": controller.current_player,
+        "game_over": controller.game_over,
+        "ply": controller.ply,
+        "history": [list(move) for move in controller.move_history],
+        "positions": list(controller.position_window),
+    }
+
+
+def restore(state, track_metrics=True):
+    """Rebuild a GameController from a snapshot dict"""
+    if state.get("version") != SESSION_VERSION:
+        raise ValueError(f"Unsupported session version: {state.get('version')}")
+
+    variant = RuleVariant.from_dict(state["variant"]) if "variant" in state else None
+    controller = GameController(
+        game_mode=state["mode"],
+        ai_difficulty=state["difficulty"],
+        board_size=state["board_size"],
+        win_length=state["win_length"],
+        variant=variant,
+        ai_sides=state.get("ai_sides"),
+        track_metrics=False,
+    )
+    # Pasang ulang sesuai urutan history supaya hash urutan Board identik
+    for row, col, player in state["history"]:
+        controller.board.place(row, col, player)
+        controller.move_history.append(Move(row, col, player))
+    # Jumlah langkah yang dimainkan; history menyusut saat removal, jadi bukan len(history).
+    # Snapshot lama tanpa "ply" hanya punya history sebagai perkiraan
+    controller.ply = state.get("ply", len(controller.move_history))
+    controller.current_player = state["current_player"]
+    controller.game_over = state["game_over"]
+
+    controller.position_window = deque(state["positions"])
+    controller.position_counts = {}
+    for key in controller.position_window:
+        controller.position_counts[key] = controller.position_counts.get(key, 0) + 1
+
+    # Game yang dilanjutkan bukan game baru: GAMES_STARTED tidak naik, tapi game yang belum
+    # selesai aktif lagi (ACTIVE_GAMES turun lagi saat selesai atau ditutup)
+    if track_metrics:
+        controller.track_metrics = True
+        for engine in controller.ai_players.values():
+            engine.track_metrics = True
+        if not controller.game_over:
+            metrics.ACTIVE_GAMES.inc()
+    return controller
+
+
+def load_session(path):
+    """Load a saved session file, or None if missing or unreadable"""
+    try:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    if not lines:
+        return None
+
+    controller = None
+    try:
+        controller = restore(json.loads(lines[0]))
+        for line in lines[1:]:
+            if not line:
+                continue
+            move = json.loads(line)
+            controller.make_move(move["row"], move["col"])
+    except (ValueError, KeyError, IndexError, TypeError):
+        if controller:
+            controller.close()
+        return None
+
+    cache = load_ai_cache(path + ".tt", controller.board.size)
+    if cache and controller.ai_player:
+        controller.ai_player.tt.update(cache)
+    return controller
+
+
+def save_ai_cache(path, tt, size):
+    """Write the AI transposition table as {key: [[row, col, score], ...]}"""
+    data = {
+        str(key): [[row, col, score] for (row, col), score in unpack_scores(packed, size)]
+        for key, packed in tt.items()
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def load_ai_cache(path, size):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return {
+        int(key): pack_scores([((row, col), score) for row, col, score in scores], size)
+        for key, scores in data.items()
+    }
+
+
+class SessionRecorder:
+    """Append each move to the session file from a background writer thread
+
+    Subscribes to the controller's events: every PiecePlaced is appended, and compaction
+    waits for TurnChanged so the snapshot never captures a half-finished move.
+    """
+
+    def __init__(self, controller, path, compact_every=50, save_ai_cache=False):
+        self.controller = controller
+        self.path = path
+        self.compact_every = compact_every
+        self.save_ai_cache = save_ai_cache
+        self._queue = queue.Queue()
+        self._appended = 0
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+        self.checkpoint()
+        controller.add_listener(self._on_event)
+
+    def _on_event(self, event):
+        if isinstance(event, PiecePlaced):
+            self.record_move(event.row, event.col)
+        elif isinstance(event, TurnChanged) and self._appended >= self.compact_every:
+            self.checkpoint()
+
+    def record_move(self, row, col):
+        """Queue one move; never blocks on disk I/O"""
+        self._appended += 1
+        self._queue.put(("append", json.dumps({"row": row, "col": col})))
+
+    def checkpoint(self):
+        """Queue a fresh snapshot that replaces the move log"""
+        self._appended = 0
+        self._queue.put(("snapshot", json.dumps(snapshot(self.controller), separators=(",", ":"))))
+
+    def discard(self):
+        """Finished or abandoned game: remove the saved session (and no cache is written)"""
+        self._queue.put(("discard", None))
+        self._shutdown(save_cache=False)
+
+    def close(self):
+        """Flush pending writes and stop the writer thread"""
+        self._shutdown(self.save_ai_cache)
+
+    def _shutdown(self, save_cache):
+        # Pemanggil sudah menghentikan search AI / ponder, jadi tt tidak berubah saat disalin
+        self.controller.remove_listener(self._on_event)
+        if save_cache and self.controller.ai_player and not self.controller.game_over:
+            tt = dict(self.controller.ai_player.tt)
+            self._queue.put(("cache", tt))
+        self._queue.put(("stop", None))
+        self._thread.join()
+
+    def _writer(self):
+        while True:
+            action, payload = self._queue.get()
+            if action == "stop":
+                return
+            try:
+                if action == "append":
+                    with open(self.path, "a") as f:
+                        f.write(payload + "\n")
+                elif action == "snapshot":
+                    tmp = self.path + ".tmp"
+                    with open(tmp, "w") as f:
+                        f.write(payload + "\n")
+                    os.replace(tmp, self.path)
+                elif action == "cache":
+                    save_ai_cache(self.path + ".tt", payload, self.controller.board.size)
+                elif action == "discard":
+                    for path in (self.path, self.path + ".tt"):
+                        if os.path.exists(path):
+                            os.remove(path)
+            except OSError:
+                # Gagal menyimpan tidak boleh menghentikan game
+                pass
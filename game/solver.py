@@ -0,0 +1,300 @@
+# Proof-number solver (df-pn) for N x N / K-in-a-row positions
+#
+#     python -m game.solver                      # selesaikan posisi kosong tiap SOLVER_CONFIGS
+#     python -m game.solver --validate 200       # cek langkah AI hard terhadap hasil solver
+#
+# Depth-first proof-number search (Nagai) dalam bentuk negamax: setiap node menyimpan
+# (phi, delta) dari sudut pandang pemain yang jalan; phi = 0 berarti tujuan pemain itu
+# terbukti, delta = 0 berarti terbukti gagal. Satu pembuktian menjawab "bisakah penyerang
+# memaksa menang?"; solve() menjalankannya untuk kedua pemain -> WIN / LOSS / DRAW.
+# Papan penuh tanpa pemenang dianggap gagal bagi penyerang. Pada varian dengan
+# penghapusan (infinite, oldest_own) papan penuh bukan akhir game, jadi kemenangan/
+# kekalahan yang terbukti tetap sah tetapi "tidak ada yang bisa memaksa menang" dilaporkan
+# UNKNOWN. Varian max_pieces (batu diangkat) tidak didukung.
+import argparse
+import random
+import time
+
+from game.board import Board, zobrist_table
+from game.rules import Rules
+from game.threats import SearchStopped
+from game.variants import get_variant
+from config.settings import SOLVER_CONFIGS, SOLVER_MAX_NODES, TT_MAX_ENTRIES
+
+INF = 10 ** 9
+OTHER = {"X": "O", "O": "X"}
+
+
+class BudgetExceeded(Exception):
+    """Raised when a proof needs more than max_nodes expansions"""
+
+
+class Solver:
+    def __init__(self, variant, max_nodes=SOLVER_MAX_NODES, max_entries=TT_MAX_ENTRIES, proofs=None):
+        if not self.supports(variant):
+            raise ValueError(f"Solver does not support rule variant: {variant.name}")
+        self.variant = variant
+        self.size = variant.board_size
+        tables = variant.tables()
+        self.windows = tables["windows"]
+        self.cell_windows = tables["cell_windows"]
+        self.columns = [[r * self.size + c for r, c in column] for column in tables["columns"]]
+        self.zobrist = zobrist_table(self.size)
+        # Papan penuh hanya seri bila varian tidak menghapus batu
+        self.full_is_draw = variant.removal is None
+        self.max_nodes = max_nodes
+        self.max_entries = max_entries
+        # Transposition table per penyerang: (hash, pemain jalan) -> (phi, delta); bisa dibagi (fork)
+        self.tables = proofs if proofs is not None else {"X": {}, "O": {}}
+        self.tt = None
+        self.stop_event = None  # diisi AIPlayer (ponder / analisis yang dibatalkan)
+        self.attacker = None
+        self.nodes = 0
+        self.cells = []
+        self.hash = 0
+        self.empty = 0
+
+    def fork(self):
+        """Solver for another board/thread that shares this one's proof tables"""
+        return Solver(self.variant, self.max_nodes, self.max_entries, self.tables)
+
+    @staticmethod
+    def supports(variant):
+        return variant.max_pieces is None
+
+    def solve(self, board, to_move):
+        """"WIN", "LOSS", "DRAW" or "UNKNOWN" for to_move (UNKNOWN: budget or non-terminal full board)"""
+        try:
+            if self.proves(board, to_move, to_move):
+                return "WIN"
+            if self.proves(board, to_move, OTHER[to_move]):
+                return "LOSS"
+        except BudgetExceeded:
+            return "UNKNOWN"
+        return "DRAW" if self.full_is_draw else "UNKNOWN"
+
+    def proves(self, board, to_move, attacker):
+        """True if attacker can force a win from board with to_move to play"""
+        self._load(board, attacker)
+        winner = self._winner()
+        if winner:
+            return winner == attacker
+        if not self.empty:
+            return False
+        self.nodes = 0
+        phi, delta = self._mid(to_move, INF, INF)
+        return (phi if to_move == attacker else delta) == 0
+
+    def winning_move(self, board, to_move):
+        """(row, col) of a proven win for to_move, or None"""
+        try:
+            if not self.proves(board, to_move, to_move):
+                return None
+        except BudgetExceeded:
+            return None
+        for idx in self._moves():
+            if self._child(idx, to_move)[1] == 0:
+                return divmod(idx, self.size)
+        return None
+
+    def losing_moves(self, board, to_move):
+        """Moves after which the opponent is proven to force a win"""
+        opponent = OTHER[to_move]
+        losing = set()
+        for row, col in self.variant.legal_moves(board):
+            board.place(row, col, to_move)
+            try:
+                if self.proves(board, opponent, opponent):
+                    losing.add((row, col))
+            except BudgetExceeded:
+                pass
+            finally:
+                board.clear(row, col)
+        return losing
+
+    def _load(self, board, attacker):
+        n = self.size
+        self.cells = [board.grid[r][c] for r in range(n) for c in range(n)]
+        self.hash = 0
+        for idx, cell in enumerate(self.cells):
+            if cell:
+                self.hash ^= self.zobrist[cell][idx]
+        self.empty = self.cells.count("")
+        self.attacker = attacker
+        self.tt = self.tables[attacker]
+
+    def _place(self, idx, player):
+        self.cells[idx] = player
+        self.hash ^= self.zobrist[player][idx]
+        self.empty -= 1
+
+    def _clear(self, idx, player):
+        self.cells[idx] = ""
+        self.hash ^= self.zobrist[player][idx]
+        self.empty += 1
+
+    def _moves(self):
+        cells = self.cells
+        if self.variant.gravity:
+            moves = []
+            for column in self.columns:
+                for idx in column:
+                    if not cells[idx]:
+                        moves.append(idx)
+                        break
+            return moves
+        return [idx for idx, cell in enumerate(cells) if not cell]
+
+    def _winner(self):
+        """Player owning a complete window on the loaded board, or None"""
+        cells = self.cells
+        for window in self.windows:
+            first = cells[window[0]]
+            if first and all(cells[i] == first for i in window):
+                return first
+        return None
+
+    def _won(self, idx, player):
+        cells = self.cells
+        for w in self.cell_windows[idx]:
+            if all(cells[i] == player for i in self.windows[w]):
+                return True
+        return False
+
+    def _child(self, idx, player):
+        """(phi, delta) of the position after player plays idx, seen by the next mover"""
+        self._place(idx, player)
+        try:
+            if self._won(idx, player):
+                return (INF, 0)  # pemain berikutnya sudah kalah
+            mover = OTHER[player]
+            entry = self.tt.get((self.hash, mover))
+            if entry is not None:
+                return entry
+            if not self.empty:
+                # Papan penuh: penyerang gagal
+                return (INF, 0) if mover == self.attacker else (0, INF)
+            return (1, 1)
+        finally:
+            self._clear(idx, player)
+
+    def _store(self, mover, value):
+        if len(self.tt) >= self.max_entries:
+            self.tt.clear()
+        self.tt[(self.hash, mover)] = value
+
+    def _mid(self, mover, phi_th, delta_th):
+        """Expand until phi >= phi_th or delta >= delta_th; returns (phi, delta)"""
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise BudgetExceeded()
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchStopped()
+        moves = self._moves()
+        next_mover = OTHER[mover]
+
+        while True:
+            # phi = min delta anak, delta = jumlah phi anak
+            delta = 0
+            best = None
+            best_phi = best_delta = second_delta = INF
+            for idx in moves:
+                child_phi, child_delta = self._child(idx, mover)
+                delta += child_phi
+                if child_delta < best_delta:
+                    second_delta = best_delta
+                    best, best_phi, best_delta = idx, child_phi, child_delta
+                elif child_delta < second_delta:
+                    second_delta = child_delta
+            phi = best_delta
+            delta = min(delta, INF)
+            if phi >= phi_th or delta >= delta_th:
+                self._store(mover, (phi, delta))
+                return phi, delta
+
+            child_phi_th = delta_th - (delta - best_phi)
+            child_delta_th = min(phi_th, second_delta + 1)
+            self._place(best, mover)
+            try:
+                self._mid(next_mover, child_phi_th, child_delta_th)
+            finally:
+                self._clear(best, mover)
+
+
+def _random_positions(variant, rng, min_empty, count):
+    """Non-terminal positions from `count` random playouts, as [(board, to_move)]"""
+    samples = []
+    for _ in range(count):
+        board = Board(variant.board_size)
+        player = "X"
+        empties = variant.board_size ** 2
+        target = rng.randint(min_empty, empties - 1)
+        while empties > target:
+            row, col = rng.choice(variant.legal_moves(board))
+            board.place(row, col, player)
+            player = OTHER[player]
+            empties -= 1
+        samples.append((board, player))
+    # Batu hanya ditambah, jadi playout sudah selesai tepat saat papan akhirnya punya garis
+    rules = Rules(Board(variant.board_size), variant.win_length)
+    winners = rules.check_win_batch([board for board, _ in samples])
+    return [sample for sample, winner in zip(samples, winners) if winner is None]
+
+
+def validate(variant, positions=100, min_empty=4, seed=0, max_nodes=None):
+    """Compare the hard AI's moves with solver results; returns (checked, mistakes)"""
+    from game.ai import AIPlayer
+
+    rng = random.Random(seed)
+    solver = Solver(variant, max_nodes=max_nodes)
+    checked = 0
+    mistakes = []
+    pending = []
+    while checked < positions:
+        if not pending:
+            pending = _random_positions(variant, rng, min_empty, positions)
+            continue
+        board, to_move = pending.pop()
+        outcome = solver.solve(board, to_move)
+        if outcome not in ("WIN", "DRAW"):
+            continue
+        ai = AIPlayer(board, "hard", ai_symbol=to_move, win_length=variant.win_length, variant=variant)
+        ai.solver = None  # uji search biasa, bukan solver-nya sendiri
+        row, col = ai.get_best_move()
+        board.place(row, col, to_move)
+        after = solver.solve(board, OTHER[to_move])
+        board.clear(row, col)
+        checked += 1
+        # WIN harus tetap menang (lawan kalah); DRAW tidak boleh jadi kalah
+        expected = "LOSS" if outcome == "WIN" else ("DRAW", "LOSS")
+        if after not in expected:
+            mistakes.append((board.copy(), to_move, (row, col), outcome, after))
+    return checked, mistakes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prove positions with df-pn search")
+    parser.add_argument("--max-nodes", type=int, default=None, help="node budget per proof")
+    parser.add_argument("--validate", type=int, default=0, help="random positions to check the hard AI on")
+    parser.add_argument("--min-empty", type=int, default=4, help="fewest empty cells in validation positions")
+    args = parser.parse_args()
+
+    for name, board_size, win_length in SOLVER_CONFIGS:
+        variant = get_variant(name).resized(board_size, win_length)
+        solver = Solver(variant, max_nodes=args.max_nodes)
+        start = time.perf_counter()
+        outcome = solver.solve(Board(board_size), "X")
+        elapsed = time.perf_counter() - start
+        entries = sum(len(table) for table in solver.tables.values())
+        print(f"{name} {board_size}x{board_size}, {win_length} sejajar: X {outcome} "
+              f"({elapsed:.2f}s, {entries} entries)")
+
+        if args.validate:
+            checked, mistakes = validate(variant, args.validate, args.min_empty, max_nodes=args.max_nodes)
+            print(f"  AI hard: {len(mistakes)} mistakes in {checked} positions")
+            for board, to_move, move, before, after in mistakes[:5]:
+                print(f"    {to_move} to move ({before}) played {move} -> opponent {after}")
+
+
+if __name__ == "__main__":
+    main()
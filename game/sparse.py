@@ -0,0 +1,61 @@
+# Sparse board store for the viewport: only occupied cells are kept
+#
+# State game tetap di Board (grid padat size x size): Rules, AI, hashing Zobrist dan
+# solver memakai indeks sel datar. Untuk menggambar papan besar (50x50) yang dibutuhkan
+# hanya sel terisi di sekitar viewport, jadi BoardView menyimpan salinannya di sini
+# sebagai {(row, col): pemain} dan tidak pernah memindai grid penuh.
+
+
+class SparseBoard:
+    __slots__ = ("size", "cells")
+
+    def __init__(self, size):
+        self.size = size
+        self.cells = {}
+
+    @classmethod
+    def from_board(cls, board):
+        """Sparse copy of a dense Board"""
+        store = cls(board.size)
+        for row, line in enumerate(board.grid):
+            for col, cell in enumerate(line):
+                if cell:
+                    store.cells[(row, col)] = cell
+        return store
+
+    def in_bounds(self, row, col):
+        return 0 <= row < self.size and 0 <= col < self.size
+
+    def get(self, row, col):
+        return self.cells.get((row, col), "")
+
+    def is_empty(self, row, col):
+        return (row, col) not in self.cells
+
+    def place(self, row, col, player):
+        """Set a cell; an empty player clears it"""
+        if player:
+            self.cells[(row, col)] = player
+        else:
+            self.cells.pop((row, col), None)
+
+    def clear(self, row, col):
+        self.cells.pop((row, col), None)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def in_window(self, row0, col0, row1, col1):
+        """Yield (row, col, player) for occupied cells with row0 <= row < row1, col0 <= col < col1"""
+        # Scan yang lebih kecil: sel terisi, atau sel di dalam jendela
+        if len(self.cells) <= max(0, row1 - row0) * max(0, col1 - col0):
+            for (row, col), player in self.cells.items():
+                if row0 <= row < row1 and col0 <= col < col1:
+                    yield row, col, player
+        else:
+            cells = self.cells
+            for row in range(row0, row1):
+                for col in range(col0, col1):
+                    player = cells.get((row, col))
+                    if player:
+                        yield row, col, player
@@ -0,0 +1,189 @@
+# Threat detection and threat-space search for K-in-a-row
+#
+# Istilah (untuk win_length K):
+#   four  = window dengan K-1 batu sendiri + 1 kosong -> sel kosong itu langsung menang
+#   sel "win"  = sel kosong sebuah four (langsung menang)
+#   sel "four" = sel kosong dari window dengan K-2 batu sendiri + 2 kosong -> memasang di
+#                situ membuat four. Tidak harus "open three": four yang tertutup di satu
+#                sisi tetap memaksa lawan blok, dan hanya itu yang dibutuhkan VCF.
+#   double threat = dua (atau lebih) sel menang berbeda sekaligus; lawan hanya bisa blok satu
+#   open three = K-2 batu dengan kedua ujung terbuka: satu langkah lagi jadi double threat,
+#                jadi ditemukan oleh VCF lawan dan ditahan lewat defences()
+from game.rules import get_tables
+
+
+class SearchStopped(Exception):
+    """Raised inside the search when stop_event is set (pondering cancelled)"""
+
+
+class ThreatSpace:
+    def __init__(self, board, win_length, variant=None):
+        self.board = board
+        self.win_length = win_length
+        self.windows, _, self.cell_windows = get_tables(board.size, win_length)
+        # Dengan gravity, sel ancaman yang belum bisa dimainkan diabaikan
+        self.gravity = variant is not None and variant.gravity
+        self.variant = variant
+        self.stop_event = None  # diisi AIPlayer; VCF berhenti bila event di-set
+        self._defence_cache = (None, None)  # (posisi, hasil defences) terakhir
+
+    def _playable(self, idx):
+        size = self.board.size
+        return not self.gravity or self.variant.is_legal(self.board, idx // size, idx % size)
+
+    def _window_counts(self, window, player):
+        """Return (own, other, empty cells) for one window"""
+        grid = self.board.grid
+        size = self.board.size
+        own = other = 0
+        empties = []
+        for idx in window:
+            cell = grid[idx // size][idx % size]
+            if cell == "":
+                empties.append(idx)
+            elif cell == player:
+                own += 1
+            else:
+                other += 1
+        return own, other, empties
+
+    def winning_cells(self, player):
+        """Cells (row, col) where player completes a window immediately"""
+        size = self.board.size
+        cells = set()
+        for window in self.windows:
+            own, other, empties = self._window_counts(window, player)
+            if own == self.win_length - 1 and not other and empties and self._playable(empties[0]):
+                cells.add(empties[0])
+        cells = sorted((idx // size, idx % size) for idx in cells)
+        if self.variant is not None and self.variant.max_pieces is not None:
+            # Batu tertua yang diangkat bisa bagian dari garis itu sendiri
+            cells = [cell for cell in cells if self._wins_after_lift(*cell, player)]
+        return cells
+
+    def _wins_after_lift(self, row, col, player):
+        undo = self._play(row, col, player)
+        try:
+            return self.variant.completes(self.board, row, col, player)
+        finally:
+            self._undo(row, col, undo)
+
+    def _play(self, row, col, player):
+        """Place with the variant's lift / full-board removal (see RuleVariant.play_move)"""
+        if self.variant is None:
+            self.board.place(row, col, player)
+            return None, None
+        return self.variant.play_move(self.board, row, col, player)
+
+    def _undo(self, row, col, undo):
+        if self.variant is None:
+            self.board.clear(row, col)
+        else:
+            self.variant.undo_move(self.board, row, col, undo)
+
+    def threats(self, player):
+        """Return {"win": cells that win now, "four": other cells that create a four}"""
+        size = self.board.size
+        wins, fours = set(), set()
+        for window in self.windows:
+            own, other, empties = self._window_counts(window, player)
+            if other:
+                continue
+            if own == self.win_length - 1:
+                wins.update(empties)
+            elif own == self.win_length - 2 and own > 0:
+                fours.update(empties)
+        fours -= wins
+        wins = {idx for idx in wins if self._playable(idx)}
+        fours = {idx for idx in fours if self._playable(idx)}
+        to_cell = lambda idx: (idx // size, idx % size)
+        return {"win": sorted(map(to_cell, wins)), "four": sorted(map(to_cell, fours))}
+
+    def move_score(self, row, col, player):
+        """Ordering score: windows through the cell that stay open for player or opponent"""
+        score = 0
+        for w in self.cell_windows[row * self.board.size + col]:
+            own, other, _ = self._window_counts(self.windows[w], player)
+            if not other:
+                score += 4 ** own        # membangun ancaman sendiri
+            if not own:
+                score += 3 ** other      # memblok ancaman lawan
+        return score
+
+    def must_play(self, player, opponent, max_depth):
+        """Win now > block opponent's win > first move of a forced win > only defence, else None"""
+        wins = self.winning_cells(player)
+        if wins:
+            return wins[0]
+        blocks = self.winning_cells(opponent)
+        if blocks:
+            return blocks[0]
+        forced = self.find_forced_win(player, opponent, max_depth)
+        if forced:
+            return forced
+        defences = self.defences(player, opponent, max_depth)
+        return defences[0] if defences and len(defences) == 1 else None
+
+    def defences(self, player, opponent, max_depth):
+        """Cells that leave opponent without a forced win; None if opponent has none
+
+        Open three termasuk di sini: lawan membuatnya jadi double threat dalam satu
+        langkah, jadi VCF lawan menemukannya. Kandidat pertahanan: langkah pertama VCF
+        itu dan semua sel tempat lawan bisa membuat four. [] = tidak ada yang menahan.
+        """
+        key = (self.board.key(), player, max_depth)
+        if self._defence_cache[0] == key:
+            return self._defence_cache[1]
+        threat = self.find_forced_win(opponent, player, max_depth)
+        result = None
+        if threat is not None:
+            candidates = set(self.threats(opponent)["four"]) | {threat}
+            candidates = sorted(candidates, key=lambda cell: (-self.move_score(cell[0], cell[1], player), cell))
+            result = [cell for cell in candidates if self._defends(*cell, player, opponent, max_depth)]
+        self._defence_cache = (key, result)
+        return result
+
+    def _defends(self, row, col, player, opponent, max_depth):
+        undo = self._play(row, col, player)
+        try:
+            if self.winning_cells(opponent):
+                return False
+            return self.find_forced_win(opponent, player, max_depth) is None
+        finally:
+            self._undo(row, col, undo)
+
+    def find_forced_win(self, player, opponent, max_depth):
+        """Threat-space search over continuous fours (VCF).
+
+        Setiap langkah penyerang harus membuat four, jadi lawan hanya punya satu
+        balasan (blok). Menang jika penyerang membuat double threat yang tidak bisa
+        dibalas dengan kemenangan langsung oleh lawan.
+        """
+        return self._vcf(player, opponent, max_depth)
+
+    def _vcf(self, player, opponent, depth):
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchStopped()
+        if depth <= 0:
+            return None
+
+        for row, col in self.threats(player)["four"]:
+            undo = self._play(row, col, player)
+            try:
+                # Lawan bisa menang duluan: ancaman ini gagal
+                if self.winning_cells(opponent):
+                    continue
+                wins = self.winning_cells(player)
+                if len(wins) >= 2:
+                    return (row, col)
+                if len(wins) == 1:
+                    block_row, block_col = wins[0]
+                    block = self._play(block_row, block_col, opponent)
+                    try:
+                        if self._vcf(player, opponent, depth - 1):
+                            return (row, col)
+                    finally:
+                        self._undo(block_row, block_col, block)
+            finally:
+                self._undo(row, col, undo)
+        return None
@@ -0,0 +1,293 @@
+# Headless round-robin tournament between AI engine settings
+#
+#     python -m game.tournament --games 20 --workers 4
+#     python -m game.tournament --seed 7 --shard 0/4 --output shard0.jsonl --resume
+#
+# Setiap pasangan engine bermain TOURNAMENT_GAMES kali (warna bergantian) di
+# process pool, lalu rating Elo dihitung dengan model Bradley-Terry.
+# Setiap game punya nomor job dan seed turunan sendiri, jadi hasilnya sama persis
+# berapa pun jumlah worker, bisa dibagi ke beberapa mesin (--shard) dan dilanjutkan
+# (--resume melewati job yang sudah ada di file output).
+import argparse
+import asyncio
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from game import metrics
+from game.ai import AIPlayer
+from game.controller import GameController
+from game.encoding import pack_moves
+from game.events import PiecePlaced
+from game.learn import load_evaluator
+from game.seeding import derive_seed, spawn_rng
+from game.variants import get_variant
+from config.settings import (
+    TOURNAMENT_ENGINES, TOURNAMENT_VARIANTS, TOURNAMENT_GAMES, TOURNAMENT_MAX_MOVES,
+    TOURNAMENT_SEED
+)
+
+
+def make_engine(spec, board, symbol, variant, rng=None):
+    """Build an AIPlayer from an engine spec dict"""
+    engine = AIPlayer(
+        board,
+        spec["difficulty"],
+        ai_symbol=symbol,
+        max_depth=spec.get("max_depth", 9),
+        win_length=variant.win_length,
+        evaluator=load_evaluator(spec["evaluator"]) if spec.get("evaluator") else None,
+        variant=variant,
+        rng=rng,
+    )
+    # Budget waktu per langkah (detik); lewat batas dipakai langkah fallback
+    engine.move_deadline = spec.get("time")
+    return engine
+
+
+def play_game(x_spec, o_spec, variant, seed=None, max_moves=TOURNAMENT_MAX_MOVES, job=None):
+    """Play one headless game and return its record (winner is "X", "O" or None)"""
+    controller = GameController(variant=variant)
+    engines = {
+        "X": make_engine(x_spec, controller.board, "X", variant, spawn_rng(seed, "X")),
+        "O": make_engine(o_spec, controller.board, "O", variant, spawn_rng(seed, "O")),
+    }
+    for symbol, engine in engines.items():
+        controller.set_ai_player(symbol, engine)
+
+    times = {"X": [], "O": []}
+    played = []
+
+    def on_event(event):
+        if isinstance(event, PiecePlaced):
+            played.append(tuple(event))
+            times[event.player].append(engines[event.player].last_move_seconds)
+
+    # Jalur async yang sama dengan GUI. Tanpa "time" di spec tidak ada deadline, jadi hasilnya
+    # deterministik; engine dengan budget waktu bergantung pada kecepatan mesin
+    controller.add_listener(on_event)
+    result = asyncio.run(controller.play_ai_turns(max_moves=max_moves))
+    moves = len(played)
+
+    controller.close()
+    winner = None
+    if controller.game_over and result not in (None, "DRAW_REMOVE", "DRAW_REPEAT", "DRAW_FULL"):
+        winner = result.split()[0]
+
+    return {
+        "job": job,
+        "seed": seed,
+        "x": x_spec["name"],
+        "o": o_spec["name"],
+        "variant": variant.name,
+        "board_size": variant.board_size,
+        "win_length": variant.win_length,
+        # Spesifikasi lengkap job, dicek saat --resume
+        "spec": {"x": x_spec, "o": o_spec, "variant": variant.to_dict()},
+        "winner": winner,
+        "moves": moves,
+        "times": times,
+        # Semua langkah yang dimainkan (termasuk yang nanti dihapus), untuk opening book
+        "archive": pack_moves(played, variant.board_size).hex(),
+    }
+
+
+def play_job(job):
+    """Play one scheduled job in a worker; returns (record, metrics delta)"""
+    index, x_spec, o_spec, variant, seed = job
+    before = metrics.REGISTRY.snapshot()
+    record = play_game(x_spec, o_spec, variant, seed, job=index)
+    return record, metrics.REGISTRY.diff(before)
+
+
+def schedule(engines, variants, games, seed=TOURNAMENT_SEED):
+    """Round-robin jobs (index, x_spec, o_spec, variant, game_seed); colors alternate"""
+    jobs = []
+    for name, board_size, win_length in variants:
+        variant = get_variant(name).resized(board_size, win_length)
+        for a, b in combinations(engines, 2):
+            for game in range(games):
+                x_spec, o_spec = (a, b) if game % 2 == 0 else (b, a)
+                # Seed per game dari labelnya, bukan dari posisi di antrean worker
+                game_seed = derive_seed(seed, name, board_size, win_length, a["name"], b["name"], game)
+                jobs.append((len(jobs), x_spec, o_spec, variant, game_seed))
+    return jobs
+
+
+def job_spec(job):
+    """What a record must carry to stand in for a scheduled job"""
+    _, x_spec, o_spec, variant, seed = job
+    return {"seed": seed, "x": x_spec, "o": o_spec, "variant": variant.to_dict()}
+
+
+def match_records(records, jobs):
+    """Split previous records into (matching, stale) against the scheduled jobs
+
+    A record matches only when the job with its index has the same seed, engine specs
+    and rules; anything else (other --seed, --games or settings) must be replayed.
+    """
+    specs = {job[0]: job_spec(job) for job in jobs}
+    matching, stale = [], []
+    for record in records:
+        expected = specs.get(record.get("job"))
+        found = {"seed": record.get("seed"), **record.get("spec", {})}
+        if expected is not None and found == expected:
+            matching.append(record)
+        else:
+            stale.append(record)
+    return matching, stale
+
+
+def load_records(path):
+    """Game records from a JSON-lines output file ([] if missing)"""
+    try:
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+def compute_elo(records, iterations=200):
+    """Fit Bradley-Terry ratings (draws = half a win) and return {name: (elo, ci95)}"""
+    names = sorted({r["x"] for r in records} | {r["o"] for r in records})
+    games = {a: {b: 0.0 for b in names} for a in names}
+    score = {a: 0.0 for a in names}
+
+    for r in records:
+        x, o = r["x"], r["o"]
+        games[x][o] += 1
+        games[o][x] += 1
+        if r["winner"] == "X":
+            score[x] += 1
+        elif r["winner"] == "O":
+            score[o] += 1
+        else:
+            score[x] += 0.5
+            score[o] += 0.5
+
+    # Satu seri virtual per pasangan supaya engine yang selalu kalah/menang tetap hingga
+    for a, b in combinations(names, 2):
+        if games[a][b]:
+            games[a][b] += 1
+            games[b][a] += 1
+            score[a] += 0.5
+            score[b] += 0.5
+
+    gamma = {a: 1.0 for a in names}
+    for _ in range(iterations):
+        for a in names:
+            denom = sum(games[a][b] / (gamma[a] + gamma[b]) for b in names if b != a)
+            if denom:
+                gamma[a] = score[a] / denom
+        # Normalisasi: rata-rata geometrik = 1 (Elo rata-rata = 0)
+        mean_log = sum(math.log(g) for g in gamma.values()) / len(names)
+        gamma = {a: g / math.exp(mean_log) for a, g in gamma.items()}
+
+    elo_scale = 400 / math.log(10)
+    ratings = {}
+    for a in names:
+        info = 0.0
+        for b in names:
+            if b != a and games[a][b]:
+                p = gamma[a] / (gamma[a] + gamma[b])
+                info += games[a][b] * p * (1 - p)
+        ci = 1.96 * elo_scale / math.sqrt(info) if info else float("inf")
+        ratings[a] = (elo_scale * math.log(gamma[a]), ci)
+    return ratings
+
+
+def move_time_stats(records):
+    """Return {name: (moves, mean_ms, p95_ms, max_ms)}"""
+    samples = {}
+    for r in records:
+        samples.setdefault(r["x"], []).extend(r["times"]["X"])
+        samples.setdefault(r["o"], []).extend(r["times"]["O"])
+
+    stats = {}
+    for name, values in samples.items():
+        values.sort()
+        if not values:
+            stats[name] = (0, 0.0, 0.0, 0.0)
+            continue
+        p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+        stats[name] = (len(values), 1000 * sum(values) / len(values), 1000 * p95, 1000 * values[-1])
+    return stats
+
+
+def run_tournament(engines=TOURNAMENT_ENGINES, variants=TOURNAMENT_VARIANTS,
+                   games=TOURNAMENT_GAMES, workers=None, seed=TOURNAMENT_SEED,
+                   shard=(0, 1), skip=(), output=None):
+    """Run this shard's jobs across a process pool and return their game records.
+
+    shard=(k, n) keeps jobs whose index % n == k; job indexes in skip are not replayed.
+    With output, each record is appended as soon as it finishes so a run can be resumed.
+    """
+    index, count = shard
+    skip = set(skip)
+    jobs = [job for job in schedule(engines, variants, games, seed)
+            if job[0] % count == index and job[0] not in skip]
+    records = []
+    out = open(output, "a") if output else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for record, delta in pool.map(play_job, jobs, chunksize=max(1, len(jobs) // 64)):
+                # Metrics worker hidup di prosesnya sendiri; gabungkan ke registry di sini
+                metrics.REGISTRY.merge(delta)
+                records.append(record)
+                if out:
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+    finally:
+        if out:
+            out.close()
+    return records
+
+
+def report(records):
+    """Print an Elo / latency table per board configuration"""
+    configs = sorted({(r["variant"], r["board_size"], r["win_length"]) for r in records})
+    for config in configs:
+        variant, board_size, win_length = config
+        subset = [r for r in records if (r["variant"], r["board_size"], r["win_length"]) == config]
+        ratings = compute_elo(subset)
+        timing = move_time_stats(subset)
+        print(f"\n== {variant} {board_size}x{board_size}, {win_length} sejajar ({len(subset)} games) ==")
+        print(f"{'engine':<12}{'elo':>8}{'±95%':>8}{'moves':>8}{'ms/move':>10}{'p95 ms':>10}{'max ms':>10}")
+        for name, (elo, ci) in sorted(ratings.items(), key=lambda item: -item[1][0]):
+            moves, mean_ms, p95_ms, max_ms = timing[name]
+            print(f"{name:<12}{elo:>8.0f}{ci:>8.0f}{moves:>8}{mean_ms:>10.2f}{p95_ms:>10.2f}{max_ms:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-robin tournament between AI engines")
+    parser.add_argument("--games", type=int, default=TOURNAMENT_GAMES, help="games per pairing")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--output", help="write game records as JSON lines")
+    parser.add_argument("--seed", type=int, default=TOURNAMENT_SEED, help="master seed")
+    parser.add_argument("--shard", default="0/1", help="run only shard K of N (K/N)")
+    parser.add_argument("--resume", action="store_true", help="skip jobs already in --output")
+    args = parser.parse_args()
+
+    index, count = map(int, args.shard.split("/"))
+    if not 0 <= index < count:
+        parser.error(f"invalid shard: {args.shard}")
+    previous = []
+    if args.output:
+        if args.resume:
+            jobs = schedule(TOURNAMENT_ENGINES, TOURNAMENT_VARIANTS, args.games, args.seed)
+            previous, stale = match_records(load_records(args.output), jobs)
+            if stale:
+                print(f"Resume: {len(stale)} record(s) in {args.output} do not match the scheduled "
+                      "job (seed, engines or rules changed); those jobs are played again")
+        else:
+            open(args.output, "w").close()
+    records = run_tournament(
+        games=args.games, workers=args.workers, seed=args.seed, shard=(index, count),
+        skip={r["job"] for r in previous}, output=args.output,
+    )
+    report(previous + records)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# Rule variants passed into GameController and AIPlayer
+#
+# Satu objek RuleVariant menggantikan aturan yang tadinya tersebar di kode:
+#   removal    : "oldest"     -> papan penuh, hapus move paling awal (mode infinite)
+#                "oldest_own" -> papan penuh, hapus move paling awal milik pemain yang baru jalan
+#                None         -> papan penuh = seri (tic tac toe klasik)
+#   max_pieces : batas batu per pemain; batu tertua pemain itu diangkat sebelum memasang yang baru
+#   gravity    : batu jatuh ke baris kosong paling bawah di kolomnya (gaya Connect Four)
+# Rules tidak tahu varian: ia hanya memeriksa window menang (board + win_length). Varian
+# dipakai GameController (langkah legal, penghapusan) dan AIPlayer, yang meneruskannya ke
+# ThreatSpace, Solver, opening book dan tabel policy (keduanya per nama varian).
+# Tabel yang bergantung varian (window menang, simetri, urutan jatuh per kolom) dibuat
+# sekali per varian lalu di-cache.
+from game.policy import symmetries
+from game.rules import get_tables
+from config.settings import BOARD_SIZE, WIN_LENGTH, RULE_VARIANT
+
+_VARIANT_TABLES = {}
+
+
+class RuleVariant:
+    def __init__(self, name, board_size=BOARD_SIZE, win_length=WIN_LENGTH, removal="oldest",
+                 max_pieces=None, gravity=False):
+        self.name = name
+        self.board_size = board_size
+        self.win_length = win_length
+        self.removal = removal
+        self.max_pieces = max_pieces
+        self.gravity = gravity
+
+    def key(self):
+        return (self.board_size, self.win_length, self.removal, self.max_pieces, self.gravity)
+
+    def resized(self, board_size, win_length):
+        """Same rules on another board configuration"""
+        return RuleVariant(self.name, board_size, win_length, self.removal, self.max_pieces, self.gravity)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "board_size": self.board_size,
+            "win_length": self.win_length,
+            "removal": self.removal,
+            "max_pieces": self.max_pieces,
+            "gravity": self.gravity,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def tables(self):
+        """Cached {"windows", "cell_windows", "symmetries", "columns"} for this variant"""
+        key = self.key()
+        tables = _VARIANT_TABLES.get(key)
+        if tables is None:
+            windows, _, cell_windows = get_tables(self.board_size, self.win_length)
+            n = self.board_size
+            if self.gravity:
+                # Gravitasi hanya simetris terhadap cermin kiri-kanan
+                perms = [list(range(n * n)), [r * n + (n - 1 - c) for r in range(n) for c in range(n)]]
+            else:
+                perms = symmetries(n)
+            # Urutan sel per kolom dari bawah ke atas (untuk gravity)
+            columns = [[(r, c) for r in range(n - 1, -1, -1)] for c in range(n)]
+            tables = {"windows": windows, "cell_windows": cell_windows, "symmetries": perms, "columns": columns}
+            _VARIANT_TABLES[key] = tables
+        return tables
+
+    def drop_row(self, board, col):
+        """Row a piece dropped in col lands on, or None if the column is full"""
+        for row, _ in self.tables()["columns"][col]:
+            if board.is_empty(row, col):
+                return row
+        return None
+
+    def is_legal(self, board, row, col):
+        if not board.is_empty(row, col):
+            return False
+        if self.gravity:
+            return self.drop_row(board, col) == row
+        return True
+
+    def legal_moves(self, board):
+        if self.gravity:
+            moves = []
+            for col in range(board.size):
+                row = self.drop_row(board, col)
+                if row is not None:
+                    moves.append((row, col))
+            return moves
+        return [(r, c) for r in range(board.size) for c in range(board.size) if board.is_empty(r, c)]
+
+    def removes_pieces(self):
+        return self.max_pieces is not None or self.removal is not None
+
+    def play_move(self, board, row, col, player):
+        """Place like GameController.make_move (lift, then full-board removal); returns undo info
+
+        Urutan pemasangan diambil dari board.order, jadi butuh Board(track_order=True);
+        tanpa itu umur batu tidak diketahui dan hanya batunya yang dipasang.
+        """
+        lifted = freed = None
+        if not (board.track_order and self.removes_pieces()):
+            board.place(row, col, player)
+            return lifted, freed
+        history = board.history()
+        index = self.piece_to_lift(history, player)
+        if index is not None:
+            lifted = (index,) + history.pop(index)
+            board.clear(lifted[1], lifted[2])
+        board.place(row, col, player)
+        history.append((row, col, player))
+        # Langkah yang menang mengakhiri game sebelum papan penuh diperiksa
+        if board.is_full() and not self.completes(board, row, col, player):
+            index = self.piece_to_remove_when_full(history, player)
+            if index is not None:
+                freed = (index,) + history[index]
+                board.clear(freed[1], freed[2])
+        return lifted, freed
+
+    def undo_move(self, board, row, col, undo):
+        """Reverse play_move: restore removed pieces at their place in the order"""
+        lifted, freed = undo
+        if freed:
+            board.insert(*freed)
+        board.clear(row, col)
+        if lifted:
+            board.insert(*lifted)
+
+    def completes(self, board, row, col, player):
+        """True if player has a full window through (row, col)"""
+        tables = self.tables()
+        size = board.size
+        grid = board.grid
+        for w in tables["cell_windows"][row * size + col]:
+            if all(grid[idx // size][idx % size] == player for idx in tables["windows"][w]):
+                return True
+        return False
+
+    def piece_to_lift(self, history, player):
+        """Index in history of the piece removed before player places (max_pieces), or None"""
+        if self.max_pieces is None:
+            return None
+        own = [i for i, move in enumerate(history) if move[2] == player]
+        return own[0] if len(own) >= self.max_pieces else None
+
+    def piece_to_remove_when_full(self, history, player):
+        """Index in history removed when the board fills up, or None (= draw)"""
+        if self.removal == "oldest":
+            return 0 if history else None
+        if self.removal == "oldest_own":
+            for i, move in enumerate(history):
+                if move[2] == player:
+                    return i
+        return None
+
+
+VARIANTS = {
+    "infinite": RuleVariant("infinite"),
+    "classic": RuleVariant("classic", removal=None),
+    "oldest_own": RuleVariant("oldest_own", removal="oldest_own"),
+    "three_pieces": RuleVariant("three_pieces", max_pieces=3),
+    "gravity": RuleVariant("gravity", board_size=7, win_length=4, removal=None, gravity=True),
+}
+
+
+def get_variant(name=RULE_VARIANT):
+    """Preset variant by name (see VARIANTS)"""
+    try:
+        return VARIANTS[name]
+    except KeyError:
+        raise ValueError(f"Unknown rule variant: {name}") from None
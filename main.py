@@ -2,8 +2,14 @@
 
 import tkinter as tk
 from ui.gui import GameGUI
+from game import metrics
+from config.settings import METRICS_PORT, METRICS_JSON_PATH, METRICS_JSON_INTERVAL
 
 def main():
+    if METRICS_PORT:
+        metrics.serve(METRICS_PORT)
+    if METRICS_JSON_PATH:
+        metrics.start_json_dump(METRICS_JSON_PATH, METRICS_JSON_INTERVAL)
     root = tk.Tk()
     app = GameGUI(root)
     root.mainloop()
@@ -0,0 +1,35 @@
+from game.ai import AIPlayer
+from game.analysis import Analyzer
+from game.controller import GameController
+from game.variants import get_variant
+
+
+def _analyze(controller):
+    analyzer = Analyzer(controller)
+    analyzer.start()
+    analyzer._thread.join(60)
+    result = analyzer.latest()
+    assert result["final"] and result["player"] == controller.current_player
+    return result
+
+
+def _best(result):
+    top = result["scores"][0][1]
+    return {move for move, score in result["scores"] if score == top}
+
+
+def test_hint_matches_hard_ai():
+    for moves, variant, expected in [([(0, 0), (1, 1), (0, 1)], "classic", {(0, 2)}),
+                                     ([(0, 0), (1, 1), (2, 2)], "classic", {(0, 1), (1, 0), (1, 2), (2, 1)}),
+                                     ([(1, 0), (0, 0), (2, 1), (0, 1), (1, 2)], "three_pieces", None)]:
+        variant = get_variant(variant)
+        controller = GameController("ai", "hard", variant=variant, track_metrics=False)
+        for move in moves:
+            controller.make_move(*move)
+        result = _analyze(controller)
+        assert result["pv"][0][:2] == result["scores"][0][0]
+        if expected:
+            assert _best(result) == expected
+        # Engine terpisah (transposition table sendiri) harus memilih salah satu langkah terbaik hint
+        engine = AIPlayer(controller.board, "hard", ai_symbol="O", variant=variant)
+        assert engine.get_best_move() in _best(result)
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import pytest
+
+from game import metrics
+from game.ai import AIPlayer, SearchStopped
+from game.controller import GameController
+from game.variants import get_variant
+
+
+class SlowAI(AIPlayer):
+    """Hard engine whose search only ends when it is stopped"""
+    stopped = []
+
+    def _get_hard_move(self):
+        self.stop_event.wait(10)
+        SlowAI.stopped.append(self.stop_event.is_set())
+        raise SearchStopped()
+
+
+def _slow_game():
+    variant = get_variant("infinite").resized(9, 5)
+    controller = GameController(variant=variant, track_metrics=False)
+    for row, col in [(4, 4), (3, 3), (4, 5)]:
+        controller.make_move(row, col)
+    engine = SlowAI(controller.board, "hard", ai_symbol="O", win_length=5, variant=variant)
+    controller.set_ai_player("O", engine)
+    return controller, engine
+
+
+def test_deadline_plays_fallback_move():
+    controller, engine = _slow_game()
+    expected = engine.fallback_move()
+    start = time.perf_counter()
+    asyncio.run(controller.ai_move_async(deadline=0.05))
+    assert time.perf_counter() - start < 5
+    assert controller.move_history[-1][:2] == expected
+    assert controller.current_player == "X"
+
+
+def test_cancel_stops_search_and_keeps_position():
+    controller, _ = _slow_game()
+    SlowAI.stopped.clear()
+    key, ply = controller.board.key(controller.current_player), controller.ply
+
+    async def cancel_after_start():
+        task = asyncio.create_task(controller.ai_move_async())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancel_after_start())
+    # Thread search sudah berhenti saat task selesai dibatalkan
+    assert SlowAI.stopped == [True]
+    assert controller.ply == ply
+    assert controller.board.key(controller.current_player) == key
+
+
+def test_async_matches_sync_for_seeded_engines():
+    sync_game = GameController("ai", "medium", ai_sides=("X", "O"), seed=7, track_metrics=False)
+    while not sync_game.game_over and sync_game.ply < 30:
+        sync_game.ai_move()
+    async_game = GameController("ai", "medium", ai_sides=("X", "O"), seed=7, track_metrics=False)
+    asyncio.run(async_game.play_ai_turns(max_moves=30))
+    assert async_game.move_history == sync_game.move_history
+    assert async_game.ply == sync_game.ply
+
+
+def test_copy_shares_solver_proofs():
+    controller = GameController("ai", "hard", variant=get_variant("classic"), track_metrics=False)
+    ai = controller.ai_player
+    clone = ai.copy(controller.board.copy())
+    assert clone.solver is not ai.solver
+    assert clone.book is ai.book and clone.tt is ai.tt
+    assert clone.solver.solve(clone.board, "X") == "DRAW"
+    assert ai.solver.tables["X"] and ai.solver.tables["X"] is clone.solver.tables["X"]
+
+
+def test_fallback_move_time_is_recorded():
+    controller, engine = _slow_game()
+    controller.track_metrics = engine.track_metrics = True
+    count = metrics.AI_MOVE_SECONDS.count
+    asyncio.run(controller.ai_move_async(deadline=0.05))
+    assert engine.last_move_seconds >= 0.05
+    assert metrics.AI_MOVE_SECONDS.count == count + 1
+    controller.close()
@@ -0,0 +1,48 @@
+import random
+
+from game.board import Board
+
+
+def _full_hash(board):
+    return _xor(board.zobrist[cell][r * board.size + c]
+                for r, row in enumerate(board.grid) for c, cell in enumerate(row) if cell)
+
+
+def _xor(keys):
+    h = 0
+    for key in keys:
+        h ^= key
+    return h
+
+
+def _rebuilt(board):
+    """Fresh board with the same stones placed in the same order"""
+    fresh = Board(board.size, track_order=True)
+    for row, col, _ in board.order:
+        fresh.place(row, col, board.grid[row][col])
+    return fresh
+
+
+def test_incremental_hashes_match_full_recompute():
+    rng = random.Random(5)
+    for size in (3, 5):
+        board = Board(size, track_order=True)
+        for _ in range(2000):
+            occupied = [(r, c) for r, c, _ in board.order]
+            action = rng.random()
+            if occupied and action < 0.15:
+                board.clear(*occupied[0])       # tertua (mode infinite)
+            elif occupied and action < 0.3:
+                board.clear(*occupied[-1])      # undo search
+            elif occupied and action < 0.4:
+                board.clear(*rng.choice(occupied))
+            else:
+                board.place(rng.randrange(size), rng.randrange(size), rng.choice("XO"))
+
+            assert board.hash == _full_hash(board)
+            assert board.stones == sum(cell != "" for row in board.grid for cell in row)
+            assert board.is_full() == (board.stones == size * size)
+            fresh = _rebuilt(board)
+            assert (board.hash, board.order_hash) == (fresh.hash, fresh.order_hash)
+            clone = board.copy()
+            assert (clone.key("O"), clone.key("X")) == (board.key("O"), board.key("X"))
@@ -0,0 +1,111 @@
+import pytest
+
+from game.board import Board
+from game.sparse import SparseBoard
+
+board_view = pytest.importorskip("ui.board_view")
+
+
+class FakeCanvas:
+    """Records canvas items instead of drawing them"""
+
+    def __init__(self, parent=None, **options):
+        self.items = []
+
+    def pack(self):
+        pass
+
+    def bind(self, event, handler):
+        pass
+
+    def config(self, **options):
+        pass
+
+    def after_idle(self, callback):
+        callback()
+        return 1
+
+    def delete(self, tag):
+        self.items = [] if tag == "all" else [item for item in self.items if tag not in item[2]]
+
+    def _create(self, kind, *coords, tags=(), **options):
+        self.items.append((kind, coords, (tags,) if isinstance(tags, str) else tags))
+
+    def create_rectangle(self, *coords, **options):
+        self._create("rect", *coords, **options)
+
+    def create_line(self, *coords, **options):
+        self._create("line", *coords, **options)
+
+    def create_text(self, *coords, **options):
+        self._create("text", *coords, **options)
+
+    def create_oval(self, *coords, **options):
+        self._create("oval", *coords, **options)
+
+
+@pytest.fixture
+def view(monkeypatch):
+    monkeypatch.setattr(board_view.tk, "Canvas", FakeCanvas)
+    clicks = []
+    view = board_view.BoardView(None, 50, lambda row, col: clicks.append((row, col)), width=400, height=300)
+    view.clicks = clicks
+    return view
+
+
+def _stone_cells(view):
+    return {tuple(map(int, tag.split("_")[1:])) for kind, _, tags in view.canvas.items
+            if kind in ("text", "oval") for tag in tags}
+
+
+def test_only_visible_cells_are_drawn(view):
+    board = Board(50)
+    for row, col in [(0, 0), (25, 25), (26, 30), (49, 49)]:
+        board.place(row, col, "X")
+    view.cell = 20
+    view.top, view.left = 20.0, 20.0
+    view.load(board)
+
+    # 300 x 400 piksel / sel 20 = baris 20..34, kolom 20..39
+    assert view.visible_range() == (20, 20, 35, 40)
+    assert _stone_cells(view) == {(25, 25), (26, 30)}
+    lines = [item for item in view.canvas.items if item[0] == "line"]
+    assert len(lines) == (35 - 20 + 1) + (40 - 20 + 1)
+
+    view.set_cell(49, 49, "")     # di luar layar: tidak ada yang digambar
+    view.set_cell(21, 21, "O")
+    assert _stone_cells(view) == {(25, 25), (26, 30), (21, 21)}
+
+
+def test_pixel_and_cell_mapping(view):
+    view.cell = 10
+    view.top, view.left = 5.5, 2.0
+    assert view.cell_at(0, 0) == (5, 2)
+    assert view.cell_at(19, 4) == (5, 3)
+    assert view.cell_at(0, 5) == (6, 2)
+    assert view._cell_box(6, 3) == (10.0, 5.0, 20.0, 15.0)
+    view.top, view.left = -1.0, 0.0
+    assert view.cell_at(0, 5) is None           # di atas baris 0
+
+    # Zoom di sekitar kursor: sel di bawah kursor tetap sama
+    view.top, view.left = 10.0, 10.0
+    before = view.cell_at(123, 77)
+    view.zoom(2, 123, 77)
+    assert view.cell == 20 and view.cell_at(123, 77) == before
+
+    # Pan dibatasi: minimal satu baris/kolom papan tetap terlihat
+    view.pan(10 ** 6, 10 ** 6)
+    row0, col0, row1, col1 = view.visible_range()
+    assert row0 < row1 and col0 < col1
+
+
+def test_sparse_store_window_scan():
+    store = SparseBoard(50)
+    for row, col in [(1, 1), (10, 10), (40, 2)]:
+        store.place(row, col, "O")
+    # Jendela besar: scan lewat dict batu; jendela kecil (< jumlah batu): scan sel jendela
+    assert sorted(store.in_window(0, 0, 20, 20)) == [(1, 1, "O"), (10, 10, "O")]
+    assert list(store.in_window(1, 1, 2, 2)) == [(1, 1, "O")]
+    assert list(store.in_window(2, 2, 3, 3)) == []
+    store.place(10, 10, "")
+    assert len(store) == 2 and store.is_empty(10, 10) and not store.in_bounds(50, 0)
@@ -0,0 +1,56 @@
+from game import book as book_module
+from game.ai import AIPlayer
+from game.board import Board
+from game.book import OpeningBook, build_tree, canonical, write_book
+from game.encoding import pack_moves
+from game.variants import get_variant
+
+
+def _record(moves, winner):
+    return {"archive": pack_moves([(row, col, None) for row, col in moves], 3).hex(), "winner": winner}
+
+
+def test_symmetric_moves_fold_into_one_entry(tmp_path):
+    variant = get_variant("classic")
+    # Keempat pojok di papan kosong, lalu balasan tengah setelah pojok yang berbeda
+    records = [_record([corner, (1, 1)], "X" if i % 2 else None)
+               for i, corner in enumerate([(0, 0), (0, 2), (2, 0), (2, 2)])]
+    tree = build_tree(records, variant, plies=2)
+
+    empty, _ = canonical(Board(3), "X", variant.tables()["symmetries"])
+    assert list(tree[empty].values()) == [[4, 2, 2]]
+    # Setelah pojok mana pun posisinya sama secara kanonik; O tidak pernah menang
+    replies = [moves for key, moves in tree.items() if key != empty]
+    assert [list(moves.values()) for moves in replies] == [[[4, 0, 2]]]
+
+    path = str(tmp_path / "book.bin")
+    write_book(path, tree, 3, 3)
+    book = OpeningBook(path, variant)
+    try:
+        row, col = book.best_move(Board(3), "X")
+        assert (row, col) in [(0, 0), (0, 2), (2, 0), (2, 2)]
+        board = Board(3)
+        board.place(2, 2, "X")
+        assert book.best_move(board, "O") == (1, 1)
+    finally:
+        book.close()
+
+
+def test_book_only_for_variants_without_removal(tmp_path, monkeypatch):
+    monkeypatch.setattr(book_module, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(book_module, "_BOOK_CACHE", {})
+    records = [_record([(0, 0), (1, 1)], None)]
+    for name in ("classic", "infinite", "three_pieces"):
+        variant = get_variant(name)
+        write_book(book_module.book_path(variant), build_tree(records, variant), 3, 3)
+
+    assert AIPlayer(Board(3), "hard", ai_symbol="X", variant=get_variant("classic")).book is not None
+    for name in ("infinite", "three_pieces"):
+        assert AIPlayer(Board(3), "hard", ai_symbol="X", variant=get_variant(name)).book is None
+
+    # Gerbang ply: setelah BOOK_MAX_PLIES batu book tidak lagi dipakai
+    board = Board(3)
+    engine = AIPlayer(board, "hard", ai_symbol="X", variant=get_variant("classic"))
+    assert engine._book_move() in [(0, 0), (0, 2), (2, 0), (2, 2)]
+    monkeypatch.setattr("game.ai.BOOK_MAX_PLIES", 0)
+    assert engine._book_move() is None
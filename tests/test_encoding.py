@@ -0,0 +1,23 @@
+import random
+
+from game.encoding import pack_moves, pack_scores, unpack_moves, unpack_scores
+
+
+def test_scores_round_trip():
+    rng = random.Random(0)
+    for size in (3, 15, 16, 255, 256, 300):
+        cells = [(rng.randrange(size), rng.randrange(size)) for _ in range(20)]
+        cells += [(0, 0), (size - 1, size - 1)]
+        scores = [(cell, rng.choice((-10 ** 6, -1, 0, 1, 10 ** 6, rng.randint(-999, 999))))
+                  for cell in cells]
+        assert unpack_scores(pack_scores(scores, size), size) == scores
+
+
+def test_moves_round_trip():
+    rng = random.Random(1)
+    for size in (3, 16, 17, 40):
+        moves = [(rng.randrange(size), rng.randrange(size), "XO"[i % 2]) for i in range(30)]
+        data = pack_moves(moves, size)
+        assert len(data) == 30 * (1 if size * size <= 256 else 2)
+        assert unpack_moves(data, size) == moves
+        assert unpack_moves(data, size, first_player="O")[0][2] == "O"
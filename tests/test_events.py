@@ -0,0 +1,57 @@
+from game.controller import GameController
+from game.events import GameWon, PiecePlaced, PieceRemoved, TurnChanged
+from game.variants import get_variant
+
+
+def _record(controller):
+    """Listener that mirrors the board from events and checks it against the controller"""
+    events = []
+    mirror = [["" for _ in range(controller.board.size)] for _ in range(controller.board.size)]
+
+    def listener(event):
+        events.append(event)
+        if isinstance(event, PiecePlaced):
+            mirror[event.row][event.col] = event.player
+        elif isinstance(event, PieceRemoved):
+            assert mirror[event.row][event.col] == event.player
+            mirror[event.row][event.col] = ""
+        elif isinstance(event, TurnChanged):
+            assert controller.current_player == event.player
+        elif isinstance(event, GameWon):
+            assert controller.game_over
+            assert all(controller.board.get(row, col) == event.player for row, col in event.cells)
+        # Setiap event dikirim setelah papan controller sudah berubah
+        assert mirror == controller.board.grid
+
+    controller.add_listener(listener)
+    return events
+
+
+def test_win_events():
+    controller = GameController(variant=get_variant("classic"), track_metrics=False)
+    events = _record(controller)
+    for move in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+        controller.make_move(*move)
+    del events[:]
+    assert controller.make_move(0, 2) == "X MENANG"
+    assert events == [PiecePlaced(0, 2, "X"), GameWon("X", [(0, 0), (0, 1), (0, 2)])]
+
+
+def test_full_board_removal_events():
+    controller = GameController(variant=get_variant("infinite"), track_metrics=False)
+    events = _record(controller)
+    for move in [(0, 0), (0, 1), (0, 2), (1, 1), (1, 0), (1, 2), (2, 1), (2, 0)]:
+        controller.make_move(*move)
+    del events[:]
+    assert controller.make_move(2, 2) == "DRAW_REMOVE"
+    assert events == [PiecePlaced(2, 2, "X"), PieceRemoved(0, 0, "X"), TurnChanged("O")]
+
+
+def test_lift_events_come_first():
+    controller = GameController(variant=get_variant("three_pieces"), track_metrics=False)
+    events = _record(controller)
+    for move in [(1, 0), (0, 0), (2, 1), (0, 1), (1, 2), (2, 2)]:
+        controller.make_move(*move)
+    del events[:]
+    controller.make_move(2, 0)
+    assert events == [PieceRemoved(1, 0, "X"), PiecePlaced(2, 0, "X"), TurnChanged("O")]
@@ -0,0 +1,32 @@
+import pytest
+
+from game.board import Board
+from game.learn import FEATURE_LEVELS, NUM_FEATURES, build_dataset, features
+
+
+def test_features_count_open_windows():
+    board = Board(3)
+    board.place(0, 0, "X")
+    board.place(0, 1, "X")
+    board.place(1, 1, "O")
+    own = features(board, 3, "X")
+    assert len(own) == NUM_FEATURES
+    # 8 window: X kurang 1 di baris 0, kurang 2 di kolom 0 (kolom 1 dan diagonal \ diblok O)
+    assert own[:FEATURE_LEVELS] == [1 / 8, 1 / 8, 0.0, 0.0]
+    # O: dari window lewat tengah, yang bebas X tinggal baris 1 dan diagonal /
+    assert own[FEATURE_LEVELS:] == [0.0, 2 / 8, 0.0, 0.0]
+    other = features(board, 3, "O")
+    assert other == own[FEATURE_LEVELS:] + own[:FEATURE_LEVELS]
+
+
+def test_training_step_reduces_loss():
+    pytest.importorskip("numpy")
+    from game.learn import Evaluator
+
+    x, y = build_dataset(6, 3, 3, seed=0)
+    assert len(x) == len(y) > 0
+    for hidden in (0, 4):
+        evaluator = Evaluator(hidden=hidden, seed=1)
+        before = evaluator.train(x, y, epochs=1)
+        after = evaluator.train(x, y, epochs=1)
+        assert after < before
@@ -0,0 +1,52 @@
+import json
+
+from game import metrics
+from game.session import load_session
+from game.tournament import play_job, schedule
+from game.variants import get_variant
+
+
+def test_worker_delta_merges_into_registry():
+    job = schedule([{"name": "easy", "difficulty": "easy"}, {"name": "medium", "difficulty": "medium"}],
+                   [("classic", 3, 3)], games=1)[0]
+    before = metrics.REGISTRY.snapshot()
+    record, delta = play_job(job)
+    assert delta[metrics.MOVES.name] == record["moves"]
+    assert delta[metrics.GAMES_STARTED.name] == 1
+    assert metrics.ACTIVE_GAMES.name not in delta
+
+    # Seolah-olah game dimainkan di proses lain: registry induk baru berubah lewat merge
+    after = metrics.REGISTRY.snapshot()
+    metrics.REGISTRY.merge(json.loads(json.dumps(delta)))
+    assert metrics.REGISTRY.diff(after) == delta
+    assert metrics.REGISTRY.diff(before)[metrics.MOVES.name] == 2 * record["moves"]
+
+
+def test_failed_load_closes_controller(tmp_path):
+    path = tmp_path / "save.json"
+    state = {"version": 1, "mode": "pvp", "difficulty": "hard", "board_size": 3, "win_length": 3,
+             "variant": get_variant("classic").to_dict(), "current_player": "X", "game_over": False,
+             "history": [], "positions": []}
+    path.write_text(json.dumps(state) + "\n{\"row\": 1}\n")
+    active = metrics.ACTIVE_GAMES.value
+    assert load_session(str(path)) is None
+    assert metrics.ACTIVE_GAMES.value == active
+
+
+def test_resume_is_active_but_not_a_new_game(tmp_path):
+    path = tmp_path / "save.json"
+    state = {"version": 1, "mode": "ai", "difficulty": "easy", "board_size": 3, "win_length": 3,
+             "variant": get_variant("classic").to_dict(), "current_player": "X", "game_over": False,
+             "history": [], "positions": []}
+    path.write_text(json.dumps(state) + "\n")
+    before = metrics.REGISTRY.snapshot()
+    controller = load_session(str(path))
+    delta = metrics.REGISTRY.diff(before)
+    assert metrics.GAMES_STARTED.name not in delta
+    assert delta[metrics.ACTIVE_GAMES.name] == 1
+    assert controller.track_metrics and controller.ai_player.track_metrics
+
+    controller.make_move(0, 0)
+    assert metrics.REGISTRY.diff(before)[metrics.MOVES.name] == 1
+    controller.close()
+    assert metrics.ACTIVE_GAMES.name not in metrics.REGISTRY.diff(before)
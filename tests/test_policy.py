@@ -0,0 +1,20 @@
+from game.ai import AIPlayer
+from game.board import Board
+from game.policy import generate_policy, load_policy
+from game.variants import get_variant
+
+
+def test_medium_policy_shared_by_board_size():
+    shipped = load_policy(3, 3)
+    assert shipped is not None
+    for name in ("classic", "infinite", "three_pieces", "oldest_own"):
+        assert AIPlayer(Board(3), "medium", variant=get_variant(name)).policy is shipped
+    assert AIPlayer(Board(7), "medium", win_length=4, variant=get_variant("gravity")).policy is None
+
+
+def test_shipped_table_matches_generator():
+    # Tabel yang dikirim = hasil generate_policy (aturan klasik), jadi bisa dibuat ulang
+    shipped = load_policy(3, 3)
+    generated = generate_policy(3, 3)
+    for key, entries in list(shipped.positions.items())[::97]:
+        assert generated.positions[key] == entries
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from game.controller import GameController
+from game.variants import VARIANTS, get_variant
+
+
+@pytest.mark.parametrize("name", sorted(VARIANTS))
+def test_key_after_matches_recorded_position(name):
+    variant = VARIANTS[name]
+    for seed in range(5):
+        rng = random.Random(seed)
+        controller = GameController(variant=variant, track_metrics=False)
+        controller.repetition_limit = 0
+        for _ in range(40):
+            if controller.game_over:
+                break
+            row, col = rng.choice(variant.legal_moves(controller.board))
+            key = controller.key_after(row, col)
+            controller.make_move(row, col)
+            if not controller.game_over:
+                assert key == controller.position_window[-1]
+
+
+def _cycle_position():
+    """three_pieces: X rotates through cells 0 2 7 3, O through 1 4 5 6, nobody gets a line.
+
+    Posisi berulang setiap 8 langkah; setelah 13 langkah O bisa kembali ke posisi langkah ke-6
+    dengan memasang di sel 5 (batu tertua O diangkat).
+    """
+    variant = get_variant("three_pieces")
+    controller = GameController("ai", "hard", variant=variant, track_metrics=False)
+    controller.repetition_limit = 0
+    x_cells, o_cells = [0, 2, 7, 3], [1, 4, 5, 6]
+    for ply in range(13):
+        cells = x_cells if ply % 2 == 0 else o_cells
+        controller.make_move(*divmod(cells[(ply // 2) % 4], 3))
+        assert not controller.game_over
+    repeating = (1, 2)
+    fresh = [move for move in variant.legal_moves(controller.board) if move != repeating]
+    assert controller.repetitions_after(*repeating) == 1
+    assert fresh and not any(controller.repetitions_after(*move) for move in fresh)
+    return controller, repeating, fresh
+
+
+def test_ai_avoids_repeating_when_ahead():
+    controller, repeating, fresh = _cycle_position()
+    ai = controller.ai_player
+    # Langkah yang mengulang posisi diberi skor tertinggi; semua langkah tetap unggul
+    scores = [(repeating, 10)] + [(move, 5) for move in fresh]
+    ai._score_moves = lambda: scores
+
+    move = ai.get_best_move()
+    assert move in fresh
+    assert controller.repetitions_after(*move) == 0
+
+    ai.repetition_after = None
+    assert ai.get_best_move() == repeating
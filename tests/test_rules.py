@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+from game.board import Board
+from game.rules import Rules
+
+
+def _mask(board, player):
+    return sum(1 << idx for idx, cell in enumerate(c for row in board.grid for c in row) if cell == player)
+
+
+def test_check_win_batch_matches_single_board_masks():
+    rng = random.Random(3)
+    for size, win_length in ((3, 3), (5, 4), (7, 4)):
+        rules = Rules(Board(size), win_length)
+        boards = []
+        for _ in range(300):
+            board = Board(size)
+            for row in range(size):
+                for col in range(size):
+                    board.place(row, col, rng.choice(("", "", "X", "O")))
+            boards.append(board)
+        expected = [rules.winner_from_masks(_mask(b, "X"), _mask(b, "O")) for b in boards]
+        assert set(expected) == {"X", "O", None}
+        assert rules.check_win_batch(boards) == expected
+    assert rules.check_win_batch([]) == []
+
+
+def test_check_win_batch_rejects_other_sizes():
+    rules = Rules(Board(3), 3)
+    with pytest.raises(ValueError):
+        rules.check_win_batch([Board(3), Board(4)])
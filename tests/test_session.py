@@ -0,0 +1,73 @@
+import os
+
+from game.controller import GameController
+from game.session import SessionRecorder, load_session, restore, snapshot
+
+
+def test_discard_leaves_no_cache(tmp_path):
+    path = str(tmp_path / "save.json")
+    controller = GameController("ai", "hard", track_metrics=False)
+    recorder = SessionRecorder(controller, path, save_ai_cache=True)
+    controller.make_move(1, 1)
+    controller.ai_move()
+    assert controller.ai_player.tt and not controller.game_over
+
+    recorder.discard()
+    assert not os.path.exists(path)
+    assert not os.path.exists(path + ".tt")
+
+
+def test_close_keeps_cache(tmp_path):
+    path = str(tmp_path / "save.json")
+    controller = GameController("ai", "hard", track_metrics=False)
+    recorder = SessionRecorder(controller, path, save_ai_cache=True)
+    controller.make_move(1, 1)
+    controller.ai_move()
+
+    recorder.close()
+    assert os.path.exists(path + ".tt")
+    restored = load_session(path)
+    assert restored.board.grid == controller.board.grid
+    assert set(controller.ai_player.tt) <= set(restored.ai_player.tt)
+
+
+def test_restore_keeps_ply_after_removals():
+    controller = GameController("pvp", track_metrics=False)
+    for row, col in [(0, 0), (0, 1), (0, 2), (1, 1), (1, 0), (1, 2), (2, 1), (2, 0), (2, 2), (0, 0)]:
+        controller.make_move(row, col)
+    # Mode infinite: history menyusut saat papan penuh, ply tidak
+    assert controller.ply > len(controller.move_history)
+
+    restored = restore(snapshot(controller))
+    assert restored.ply == controller.ply
+    restored.close()
+
+
+def _state(controller):
+    return (controller.board.grid, list(controller.move_history), controller.current_player,
+            controller.game_over, controller.ply, list(controller.position_window),
+            controller.position_counts, controller.board.key(controller.current_player))
+
+
+def test_snapshot_and_move_log_round_trip(tmp_path):
+    path = str(tmp_path / "save.json")
+    moves = [(0, 0), (0, 1), (0, 2), (1, 1), (1, 0), (1, 2), (2, 1), (2, 0), (2, 2),
+             (0, 0), (0, 1), (0, 2), (1, 1)]
+    # compact_every kecil: file berisi snapshot hasil compaction plus log langkah sesudahnya
+    controller = GameController("pvp", track_metrics=False)
+    recorder = SessionRecorder(controller, path, compact_every=4)
+    for row, col in moves[:-2]:
+        controller.make_move(row, col)
+    recorder.close()
+    with open(path) as f:
+        assert len(f.read().splitlines()) > 1
+
+    restored = load_session(path)
+    assert _state(restored) == _state(controller)
+
+    # Lanjutan game identik, termasuk penghapusan dan hitungan repetisi
+    for row, col in moves[-2:]:
+        assert restored.make_move(row, col) == controller.make_move(row, col)
+        assert _state(restored) == _state(controller)
+    restored.close()
+    controller.close()
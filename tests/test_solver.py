@@ -0,0 +1,41 @@
+import threading
+
+import pytest
+
+from game.board import Board
+from game.solver import Solver, validate
+from game.threats import SearchStopped
+from game.variants import get_variant
+
+
+def test_classic_3x3_is_a_draw():
+    solver = Solver(get_variant("classic"))
+    assert solver.solve(Board(3), "X") == "DRAW"
+    assert solver.winning_move(Board(3), "X") is None
+
+
+def test_4x4_three_in_a_row_is_a_first_player_win():
+    solver = Solver(get_variant("classic").resized(4, 3))
+    board = Board(4)
+    assert solver.solve(board, "X") == "WIN"
+
+    move = solver.winning_move(board, "X")
+    board.place(*move, "X")
+    assert solver.solve(board, "O") == "LOSS"
+
+
+def test_budget_and_stop_event():
+    variant = get_variant("classic").resized(4, 3)
+    assert Solver(variant, max_nodes=10).solve(Board(4), "X") == "UNKNOWN"
+
+    solver = Solver(variant)
+    solver.stop_event = threading.Event()
+    solver.stop_event.set()
+    with pytest.raises(SearchStopped):
+        solver.solve(Board(4), "X")
+
+
+def test_validate_samples_only_open_positions():
+    checked, mistakes = validate(get_variant("classic"), positions=20, min_empty=3, seed=1)
+    assert checked == 20
+    assert mistakes == []
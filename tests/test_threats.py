@@ -0,0 +1,37 @@
+from game.ai import AIPlayer
+from game.board import Board
+from game.threats import ThreatSpace
+from game.variants import get_variant
+
+
+def test_four_cells_include_closed_lines():
+    # X X _ _ O di tepi papan: tertutup di kedua sisi, tapi (0,2)/(0,3) tetap membuat four
+    board = Board(5)
+    for col, player in ((0, "X"), (1, "X"), (4, "O")):
+        board.place(0, col, player)
+    threats = ThreatSpace(board, 4).threats("X")
+    assert threats["win"] == []
+    assert (0, 2) in threats["four"] and (0, 3) in threats["four"]
+
+    board.place(0, 2, "X")
+    threats = ThreatSpace(board, 4).threats("X")
+    assert threats["win"] == [(0, 3)]
+    assert (0, 3) not in threats["four"]
+
+
+def test_open_two_is_defended_two_moves_ahead():
+    # K=4: _ _ X X _ _ _ ; X di (3,4) atau (3,1) membuat open three = dua sel menang
+    for variant, row in ((get_variant("classic").resized(7, 4), 3), (get_variant("gravity"), 6)):
+        board = Board(7)
+        board.place(row, 2, "X")
+        board.place(row, 3, "X")
+        threats = ThreatSpace(board, 4, variant)
+        assert threats.winning_cells("X") == []
+        assert threats.find_forced_win("X", "O", 4) in [(row, 1), (row, 4)]
+        assert sorted(threats.defences("O", "X", 4)) == [(row, 1), (row, 4)]
+        assert threats.defences("X", "O", 4) is None
+
+        move = AIPlayer(board, "hard", ai_symbol="O", win_length=4, variant=variant).get_best_move()
+        assert move in [(row, 1), (row, 4)]
+        board.place(*move, "O")
+        assert ThreatSpace(board, 4, variant).find_forced_win("X", "O", 4) is None
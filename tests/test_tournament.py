@@ -0,0 +1,59 @@
+import json
+
+from game.tournament import match_records, play_game, schedule
+
+ENGINES = [{"name": "easy", "difficulty": "easy"}, {"name": "medium", "difficulty": "medium"}]
+
+
+def _record(job):
+    index, x_spec, o_spec, variant, seed = job
+    # Lewat JSON seperti record yang dibaca dari file output
+    return json.loads(json.dumps(play_game(x_spec, o_spec, variant, seed, job=index)))
+
+
+def test_resume_keeps_only_matching_records():
+    jobs = schedule(ENGINES, [("classic", 3, 3)], games=2, seed=1)
+    records = [_record(job) for job in jobs]
+    assert match_records(records, jobs) == (records, [])
+
+    # Seed lain, engine lain atau aturan lain: nomor job sama tapi bukan game yang sama
+    for other in (schedule(ENGINES, [("classic", 3, 3)], games=2, seed=2),
+                  schedule([ENGINES[0], {**ENGINES[1], "max_depth": 2}], [("classic", 3, 3)], games=2, seed=1),
+                  schedule(ENGINES, [("classic", 4, 3)], games=2, seed=1)):
+        assert match_records(records, other) == ([], records)
+    assert match_records(records, jobs[:1]) == (records[:1], records[1:])
+
+
+def test_coordinator_resume_replays_stale_records(tmp_path):
+    from game.distributed import Coordinator
+
+    path = tmp_path / "games.jsonl"
+    jobs = schedule(ENGINES, [("classic", 3, 3)], games=2, seed=1)
+    records = [_record(job) for job in jobs]
+    records[1]["seed"] += 1
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+
+    coordinator = Coordinator(jobs, str(path), resume=True)
+    assert coordinator.records == records[:1]
+    assert coordinator.stale == records[1:]
+    assert list(coordinator.pending) == [jobs[1][0]]
+
+
+def test_time_budget_reaches_the_async_deadline(monkeypatch):
+    from game.ai import AIPlayer
+    from game.board import Board
+    from game.tournament import make_engine
+
+    spec = {"name": "hard-fast", "difficulty": "hard", "time": 0.001}
+    variant = schedule(ENGINES, [("classic", 5, 4)], games=1)[0][3]
+    assert make_engine(spec, Board(5), "X", variant).move_deadline == 0.001
+    assert make_engine(ENGINES[1], Board(5), "X", variant).move_deadline is None
+
+    fallbacks = []
+    fallback_move = AIPlayer.fallback_move
+    monkeypatch.setattr(AIPlayer, "fallback_move", lambda self: fallbacks.append(1) or fallback_move(self))
+    # Search 5x5 jauh lebih lama dari 1 ms: langkah berhenti di deadline, game tetap selesai
+    record = play_game(spec, ENGINES[1], variant, seed=3, max_moves=12)
+    assert fallbacks
+    assert len(fallbacks) <= len(record["times"]["X"])
+    assert record["spec"]["x"]["time"] == 0.001
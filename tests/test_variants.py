@@ -0,0 +1,44 @@
+import random
+
+from game.controller import GameController
+from game.variants import get_variant
+
+
+def _board_state(board):
+    return [list(row) for row in board.grid], list(board.order), board.hash, board.order_hash
+
+
+def test_play_move_matches_controller_and_undoes():
+    rng = random.Random(11)
+    for name in ("infinite", "oldest_own", "three_pieces", "classic"):
+        variant = get_variant(name)
+        controller = GameController(variant=variant, track_metrics=False)
+        for _ in range(40):
+            if controller.game_over:
+                break
+            board = controller.board
+            before = _board_state(board)
+            for row, col in variant.legal_moves(board):
+                player = controller.current_player
+                game = controller.copy()
+                game.make_move(row, col)
+                undo = variant.play_move(board, row, col, player)
+                assert _board_state(board)[:2] == _board_state(game.board)[:2]
+                assert board.key(player) == game.board.key(player)
+                variant.undo_move(board, row, col, undo)
+                assert _board_state(board) == before
+            controller.make_move(*rng.choice(variant.legal_moves(board)))
+
+
+def test_hard_ai_sees_its_own_lift():
+    # three_pieces: O di (0,0), (0,1), (2,2). (0,2) mengangkat (0,0) dulu, jadi bukan kemenangan
+    controller = GameController("ai", "hard", variant=get_variant("three_pieces"), track_metrics=False)
+    for row, col in [(1, 0), (0, 0), (2, 1), (0, 1), (1, 2), (2, 2), (2, 0)]:
+        controller.make_move(row, col)
+    engine = controller.ai_player
+    assert controller.current_player == "O"
+    assert engine.threats.winning_cells("O") == []
+    assert engine.get_best_move() != (0, 2)
+
+    controller.make_move(0, 2)
+    assert not controller.game_over
@@ -0,0 +1,245 @@
+# Virtualized board viewport on a single Tk canvas
+#
+# Satu widget per sel tidak mungkin untuk papan 50x50. BoardView
+# menggambar hanya sel yang terlihat: garis grid (satu per baris/kolom terlihat), batu
+# dari SparseBoard, dan tanda (hint, sel pemenang). Drag = geser, scroll = zoom di
+# sekitar kursor; gambar ulang penuh digabung ke satu after_idle, sedangkan event
+# controller hanya menggambar ulang sel yang berubah.
+import math
+import tkinter as tk
+
+from game.sparse import SparseBoard
+from config.settings import (
+    CELL_SIZE, CELL_SIZE_MIN, CELL_SIZE_MAX, VIEW_SIZE, DRAG_THRESHOLD,
+    COLOR_X, COLOR_O, BG_COLOR, BUTTON_BG, BUTTON_HOVER, BUTTON_FG, BORDER_COLOR
+)
+
+ZOOM_STEP = 1.25
+MIN_TEXT_CELL = 16  # sel lebih kecil: batu digambar sebagai titik, teks hint disembunyikan
+
+
+class BoardView:
+    def __init__(self, parent, size, on_click, width=VIEW_SIZE, height=VIEW_SIZE):
+        self.size = size
+        self.on_click = on_click
+        self.width = width
+        self.height = height
+        self.store = SparseBoard(size)
+        self.marks = {}  # (row, col) -> (warna latar, teks)
+        self.enabled = True
+        self.cell = CELL_SIZE
+        self.top = 0.0   # koordinat papan (baris, kolom) di pojok kiri atas canvas
+        self.left = 0.0
+        self._press = None
+        self._dragging = False
+        self._hover = None
+        self._redraw_job = None
+
+        self.canvas = tk.Canvas(parent, width=width, height=height, bg=BG_COLOR,
+                                highlightthickness=0, cursor="hand2")
+        self.canvas.pack()
+        self.canvas.bind("<ButtonPress-1>", self._on_press)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<ButtonRelease-1>", self._on_release)
+        self.canvas.bind("<Motion>", self._on_motion)
+        self.canvas.bind("<Leave>", lambda event: self._set_hover(None))
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda event: self.zoom(ZOOM_STEP, event.x, event.y))
+        self.canvas.bind("<Button-5>", lambda event: self.zoom(1 / ZOOM_STEP, event.x, event.y))
+        self.fit()
+
+    # --- state -----------------------------------------------------------
+
+    def load(self, board):
+        """Replace the displayed stones with those of a dense Board"""
+        self.store = SparseBoard.from_board(board)
+        self.redraw()
+
+    def set_cell(self, row, col, player):
+        self.store.place(row, col, player)
+        if self._hover == (row, col):
+            self._set_hover(None)
+        self.draw_cell(row, col)
+
+    def set_marks(self, marks):
+        """Replace cell marks: {(row, col): (color, text)}"""
+        old = self.marks
+        self.marks = dict(marks)
+        for row, col in set(old) | set(self.marks):
+            self.draw_cell(row, col)
+
+    def clear_marks(self):
+        self.set_marks({})
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.canvas.config(cursor="hand2" if enabled else "arrow")
+        self._set_hover(None)
+
+    # --- viewport --------------------------------------------------------
+
+    def fit(self):
+        """Show the whole board if cells stay readable, otherwise CELL_SIZE around the centre"""
+        fit = min(self.width, self.height) // self.size
+        self.cell = min(fit, CELL_SIZE_MAX) if fit >= CELL_SIZE // 2 else CELL_SIZE
+        center = self.size / 2
+        self.top = center - self.height / self.cell / 2
+        self.left = center - self.width / self.cell / 2
+        self.redraw()
+
+    def pan(self, dx, dy):
+        """Scroll by dx, dy pixels"""
+        self.left += dx / self.cell
+        self.top += dy / self.cell
+        self._clamp()
+        self.schedule_redraw()
+
+    def zoom(self, factor, x=None, y=None):
+        """Zoom around canvas pixel (x, y), default the centre"""
+        x = self.width / 2 if x is None else x
+        y = self.height / 2 if y is None else y
+        cell = max(CELL_SIZE_MIN, min(CELL_SIZE_MAX, round(self.cell * factor)))
+        if cell == self.cell:
+            return
+        # Titik papan di bawah kursor tetap di tempatnya
+        row, col = self.top + y / self.cell, self.left + x / self.cell
+        self.cell = cell
+        self.top, self.left = row - y / cell, col - x / cell
+        self._clamp()
+        self.schedule_redraw()
+
+    def _clamp(self):
+        """Keep at least one row/column of the board on screen"""
+        rows, cols = self.height / self.cell, self.width / self.cell
+        self.top = max(1 - rows, min(self.size - 1, self.top))
+        self.left = max(1 - cols, min(self.size - 1, self.left))
+
+    def visible_range(self):
+        """(row0, col0, row1, col1) of the cells on screen, half-open"""
+        row0, col0 = math.floor(self.top), math.floor(self.left)
+        row1 = math.ceil(self.top + self.height / self.cell)
+        col1 = math.ceil(self.left + self.width / self.cell)
+        return max(0, row0), max(0, col0), min(self.size, row1), min(self.size, col1)
+
+    def cell_at(self, x, y):
+        """(row, col) under canvas pixel (x, y), or None outside the board"""
+        row = math.floor(self.top + y / self.cell)
+        col = math.floor(self.left + x / self.cell)
+        return (row, col) if self.store.in_bounds(row, col) else None
+
+    def _cell_box(self, row, col):
+        x0 = (col - self.left) * self.cell
+        y0 = (row - self.top) * self.cell
+        return x0, y0, x0 + self.cell, y0 + self.cell
+
+    # --- drawing ---------------------------------------------------------
+
+    def schedule_redraw(self):
+        """Coalesce redraws (drag / wheel bursts) into one per idle"""
+        if self._redraw_job is None:
+            self._redraw_job = self.canvas.after_idle(self.redraw)
+
+    def redraw(self):
+        """Redraw everything on screen: O(visible rows + columns + occupied cells)"""
+        self._redraw_job = None
+        canvas = self.canvas
+        canvas.delete("all")
+        row0, col0, row1, col1 = self.visible_range()
+        if row0 >= row1 or col0 >= col1:
+            return
+
+        x0, y0, _, _ = self._cell_box(row0, col0)
+        x1, y1, _, _ = self._cell_box(row1, col1)
+        canvas.create_rectangle(x0, y0, x1, y1, fill=BUTTON_BG, outline="")
+        for row in range(row0, row1 + 1):
+            y = (row - self.top) * self.cell
+            canvas.create_line(x0, y, x1, y, fill=BORDER_COLOR)
+        for col in range(col0, col1 + 1):
+            x = (col - self.left) * self.cell
+            canvas.create_line(x, y0, x, y1, fill=BORDER_COLOR)
+
+        cells = {(row, col) for row, col in self.marks if row0 <= row < row1 and col0 <= col < col1}
+        cells.update((row, col) for row, col, _ in self.store.in_window(row0, col0, row1, col1))
+        for row, col in cells:
+            self._draw_items(row, col)
+        self._hover = None
+
+    def draw_cell(self, row, col):
+        """Redraw a single cell (no-op when off screen)"""
+        self.canvas.delete(self._tag(row, col))
+        row0, col0, row1, col1 = self.visible_range()
+        if row0 <= row < row1 and col0 <= col < col1:
+            self._draw_items(row, col)
+
+    @staticmethod
+    def _tag(row, col):
+        return f"cell_{row}_{col}"
+
+    def _draw_items(self, row, col):
+        canvas = self.canvas
+        tag = self._tag(row, col)
+        x0, y0, x1, y1 = self._cell_box(row, col)
+        mark = self.marks.get((row, col))
+        if mark:
+            canvas.create_rectangle(x0 + 1, y0 + 1, x1, y1, fill=mark[0], outline="", tags=tag)
+
+        player = self.store.get(row, col)
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        if player:
+            color = COLOR_X if player == "X" else COLOR_O
+            if self.cell >= MIN_TEXT_CELL:
+                canvas.create_text(cx, cy, text=player, fill=color, tags=tag,
+                                   font=("Arial", max(6, int(self.cell * 0.45)), "bold"))
+            else:
+                r = max(1, self.cell * 0.35)
+                canvas.create_oval(cx - r, cy - r, cx + r, cy + r, fill=color, outline="", tags=tag)
+        elif mark and mark[1] and self.cell >= MIN_TEXT_CELL * 2:
+            canvas.create_text(cx, cy, text=mark[1], fill=BUTTON_FG, tags=tag,
+                               font=("Arial", max(6, self.cell // 6)))
+
+    def _set_hover(self, cell):
+        if cell == self._hover:
+            return
+        self.canvas.delete("hover")
+        self._hover = cell
+        if cell is None or not self.store.is_empty(*cell) or cell in self.marks:
+            return
+        x0, y0, x1, y1 = self._cell_box(*cell)
+        self.canvas.create_rectangle(x0 + 1, y0 + 1, x1, y1, fill=BUTTON_HOVER, outline="", tags="hover")
+
+    # --- mouse -----------------------------------------------------------
+
+    def _on_press(self, event):
+        self._press = (event.x, event.y, self.top, self.left)
+        self._dragging = False
+
+    def _on_drag(self, event):
+        if self._press is None:
+            return
+        x, y, top, left = self._press
+        if not self._dragging and max(abs(event.x - x), abs(event.y - y)) <= DRAG_THRESHOLD:
+            return
+        self._dragging = True
+        self.canvas.config(cursor="fleur")
+        self.top, self.left = top, left
+        self.pan(x - event.x, y - event.y)
+
+    def _on_release(self, event):
+        press, dragging = self._press, self._dragging
+        self._press = None
+        self._dragging = False
+        if dragging:
+            self.canvas.config(cursor="hand2" if self.enabled else "arrow")
+            return
+        if press is None or not self.enabled:
+            return
+        cell = self.cell_at(event.x, event.y)
+        if cell is not None:
+            self.on_click(*cell)
+
+    def _on_motion(self, event):
+        if self.enabled and self._press is None:
+            self._set_hover(self.cell_at(event.x, event.y))
+
+    def _on_wheel(self, event):
+        self.zoom(ZOOM_STEP if event.delta > 0 else 1 / ZOOM_STEP, event.x, event.y)
@@ -1,13 +1,34 @@
 # Tkinter GUI code with enhanced UI/UX and AI Mode
+import asyncio
+import os
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import messagebox
+from game.analysis import Analyzer
 from game.controller import GameController
+from game.events import PiecePlaced, PieceRemoved, TurnChanged, GameWon, GameDrawn
+from game.ponder import Ponderer
+from game.session import SessionRecorder, load_session
+from ui.board_view import BoardView
 from config.settings import (
-    BOARD_SIZE, WINDOW_TITLE, FONT, TITLE_FONT, STATUS_FONT, INFO_FONT,
+    PONDER_ENABLED, AI_MOVE_DEADLINE, AI_MOVE_DELAY_MS, ASYNC_POLL_MS, HINT_POLL_MS, HINT_GOOD, HINT_BAD, SAVE_PATH, SAVE_AI_CACHE, SESSION_COMPACT_EVERY, WINDOW_TITLE, FONT, TITLE_FONT, STATUS_FONT, INFO_FONT,
     COLOR_X, COLOR_O, COLOR_ACCENT, BG_COLOR, PANEL_BG, BUTTON_BG, 
     BUTTON_HOVER, BUTTON_FG, BORDER_COLOR, TEXT_INFO
 )
 
+DRAW_MESSAGES = {
+    "repeat": "Posisi berulang - permainan seri",
+    "full": "Papan penuh - permainan seri",
+}
+
+
+def _blend(color_a, color_b, t):
+    """Mix two #rrggbb colors, t=0 -> color_a, t=1 -> color_b"""
+    a = [int(color_a[i:i + 2], 16) for i in (1, 3, 5)]
+    b = [int(color_b[i:i + 2], 16) for i in (1, 3, 5)]
+    return "#" + "".join(f"{round(x + (y - x) * t):02x}" for x, y in zip(a, b))
+
+
 class GameGUI:
     def __init__(self, root):
         self.root = root
@@ -16,12 +37,24 @@ class GameGUI:
         self.root.resizable(False, False)
         
         self.controller = None
-        self.buttons = []
+        self.ponderer = None
+        self.analyzer = None
+        self.show_hints = False
+        self._hint_job = None
+        self.recorder = None
+        self.view = None
         self.game_mode = None
         self.ai_difficulty = None
         self.current_frame = None
+        # Langkah AI lewat GameController.ai_move_async: loop asyncio dijalankan sedikit-sedikit
+        # dari root.after, jadi event controller tetap diproses di thread Tk
+        self.loop = asyncio.new_event_loop()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self._ai_task = None
+        self.root.after(ASYNC_POLL_MS, self._pump_async)
         
         # Configure window
+        self.root.protocol("WM_DELETE_WINDOW", self._quit)
         self._configure_window()
         self._show_mode_selection()
         
@@ -40,10 +73,14 @@ class GameGUI:
         """Clear current frame"""
         if self.current_frame:
             self.current_frame.destroy()
-        self.buttons = []
+        self.view = None
 
     def _show_mode_selection(self):
         """Show mode selection menu"""
+        self._stop_background()
+        self._close_session()
+        if self.controller:
+            self.controller.close()
         self._clear_frame()
         
         self.current_frame = tk.Frame(self.root, bg=BG_COLOR)
@@ -72,6 +109,23 @@ class GameGUI:
         btn_container = tk.Frame(self.current_frame, bg=BG_COLOR)
         btn_container.pack(pady=30)
         
+        # Resume saved game
+        if os.path.exists(SAVE_PATH):
+            resume_btn = tk.Button(
+                btn_container,
+                text="▶ Lanjutkan Game",
+                font=("Arial", 14, "bold"),
+                width=20,
+                height=2,
+                bg=COLOR_ACCENT,
+                fg="#000000",
+                border=0,
+                cursor="hand2",
+                command=self._resume_game,
+                activebackground="#FFC868"
+            )
+            resume_btn.pack(pady=10)
+        
         # PvP Button
         pvp_btn = tk.Button(
             btn_container,
@@ -141,7 +195,57 @@ class GameGUI:
         self.game_mode = mode
         self.ai_difficulty = difficulty
         self.controller = GameController(game_mode=mode, ai_difficulty=difficulty or "medium")
+        self._begin_session()
         self._create_game_ui()
+        self._start_analysis()
+
+    def _resume_game(self):
+        """Resume the game saved in SAVE_PATH"""
+        controller = load_session(SAVE_PATH)
+        if controller is None or controller.game_over:
+            os.remove(SAVE_PATH)
+            self._show_mode_selection()
+            return
+        
+        self.game_mode = controller.game_mode
+        self.ai_difficulty = controller.ai_difficulty if controller.game_mode == "ai" else None
+        self.controller = controller
+        self._begin_session()
+        self._create_game_ui()
+        self.refresh_board()
+        self._update_status()
+        self._after_move()
+
+    def _begin_session(self):
+        """Attach pondering and autosave to the current controller"""
+        self.ponderer = Ponderer(self.controller) if PONDER_ENABLED else None
+        self.analyzer = Analyzer(self.controller)
+        self.controller.add_listener(self._on_game_event)
+        self.recorder = SessionRecorder(
+            self.controller, SAVE_PATH,
+            compact_every=SESSION_COMPACT_EVERY,
+            save_ai_cache=SAVE_AI_CACHE,
+        )
+
+    def _close_session(self):
+        """Flush the autosave (the game can be resumed later)"""
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+
+    def _end_session(self):
+        """Game finished: nothing left to resume"""
+        if self.recorder:
+            self.recorder.discard()
+            self.recorder = None
+
+    def _new_game(self):
+        """Abandon the current game and go back to the menu"""
+        # Search AI / ponder berhenti dulu, baru sesi (dan cache-nya) ditutup
+        self._stop_background()
+        self._end_session()
+        self._show_mode_selection()
+
     def _create_game_ui(self):
         """Create main game UI layout"""
         self._clear_frame()
@@ -205,13 +309,22 @@ class GameGUI:
         
         info_text = tk.Label(
             info_frame,
-            text="🔴 Merah = X  |  🔵 Biru = O  |  Raih 3 Sejajar untuk Menang!",
+            text=f"🔴 Merah = X  |  🔵 Biru = O  |  Raih {self.controller.rules.win_length} Sejajar untuk Menang!",
             font=("Arial", 11),
             bg=PANEL_BG,
             fg=TEXT_INFO
         )
         info_text.pack(pady=8)
         
+        self.hint_label = tk.Label(
+            info_frame,
+            text="",
+            font=("Arial", 10),
+            bg=PANEL_BG,
+            fg=TEXT_INFO
+        )
+        self.hint_label.pack(pady=(0, 8))
+        
         # Buttons Panel
         button_frame = tk.Frame(self.current_frame, bg=BG_COLOR)
         button_frame.pack(fill=tk.X, padx=20, pady=(0, 15))
@@ -226,11 +339,26 @@ class GameGUI:
             pady=8,
             border=0,
             cursor="hand2",
-            command=self._show_mode_selection,
+            command=self._new_game,
             activebackground="#FFC868"
         )
         reset_btn.pack(side=tk.LEFT, padx=5)
         
+        self.hint_btn = tk.Button(
+            button_frame,
+            text="💡 Hint: ON" if self.show_hints else "💡 Hint: OFF",
+            font=("Arial", 11, "bold"),
+            bg=BUTTON_BG,
+            fg=BUTTON_FG,
+            padx=15,
+            pady=8,
+            border=0,
+            cursor="hand2",
+            command=self._toggle_hints,
+            activebackground=BUTTON_HOVER
+        )
+        self.hint_btn.pack(side=tk.LEFT, padx=5)
+        
         quit_btn = tk.Button(
             button_frame,
             text="❌ Quit",
@@ -241,40 +369,22 @@ class GameGUI:
             pady=8,
             border=0,
             cursor="hand2",
-            command=self.root.quit,
+            command=self._quit,
             activebackground="#5d5d5d"
         )
         quit_btn.pack(side=tk.RIGHT, padx=5)
 
     def _create_board(self, parent):
-        """Create game board with enhanced styling"""
-        for r in range(BOARD_SIZE):
-            row_buttons = []
-            for c in range(BOARD_SIZE):
-                btn = tk.Button(
-                    parent,
-                    text="",
-                    width=7,
-                    height=4,
-                    font=("Arial", 18, "bold"),
-                    bg=BUTTON_BG,
-                    fg=BUTTON_FG,
-                    border=1,
-                    relief=tk.RAISED,
-                    activebackground=BUTTON_HOVER,
-                    cursor="hand2",
-                    command=lambda r=r, c=c: self.on_click(r, c)
-                )
-                btn.grid(row=r, column=c, padx=2, pady=2)
-                row_buttons.append(btn)
-            self.buttons.append(row_buttons)
+        """Create the board viewport (only visible cells are drawn)"""
+        self.view = BoardView(parent, self.controller.board.size, self.on_click)
+        self.view.load(self.controller.board)
 
     def _update_status(self):
         """Update status label"""
         if self.controller.game_over:
-            self.status_label.config(text="✅ GAME OVER - PEMENANG DITEMUKAN!", fg=COLOR_ACCENT)
+            self.status_label.config(text="✅ GAME OVER!", fg=COLOR_ACCENT)
         else:
-            if self.game_mode == "ai" and self.controller.current_player == "O":
+            if self.controller.is_ai_turn():
                 self.status_label.config(text="🤖 AI Sedang Berpikir...", fg=COLOR_O)
             else:
                 player = self.controller.current_player
@@ -287,96 +397,185 @@ class GameGUI:
         if self.controller.game_over:
             return
         
-        if self.game_mode == "ai" and self.controller.current_player == "O":
+        if self.controller.is_ai_turn():
             return
         
-        result = self.controller.make_move(row, col)
-
-        if result == "DRAW_REMOVE":
-            self.refresh_board()
-            # Setelah refresh, jika giliran ke AI, jalankan AI move
-            if self.game_mode == "ai" and self.controller.current_player == "O":
-                self.root.after(800, self._execute_ai_move)
-        elif result is None:
-            player = self.controller.board.get(row, col)
-            color = COLOR_X if player == "X" else COLOR_O
-            self.buttons[row][col].config(
-                text=player,
-                fg=color,
-                state=tk.DISABLED
-            )
-            self._update_status()
-            
-            # Jika AI mode, jalankan AI move
-            if self.game_mode == "ai" and self.controller.current_player == "O":
-                self.root.after(800, self._execute_ai_move)
+        # Varian gravity: batu jatuh ke baris kosong terbawah di kolom yang diklik
+        variant = self.controller.variant
+        if variant.gravity:
+            row = variant.drop_row(self.controller.board, col)
+            if row is None:
+                return
+        if not variant.is_legal(self.controller.board, row, col):
+            return
+
+        # Hasil ponder sudah ada di transposition table AI
+        self._stop_pondering()
+        # Papan, status dan autosave diperbarui lewat event controller
+        self.controller.make_move(row, col)
+        self._after_move()
+
+    async def _execute_ai_move(self):
+        """Execute AI moves without blocking Tk (either side may be the AI)"""
+        try:
+            await self.controller.play_ai_turns(self.executor, AI_MOVE_DEADLINE, delay=AI_MOVE_DELAY_MS / 1000)
+        except asyncio.CancelledError:
+            return
+        self._ai_task = None
+        self._after_move()
+
+    def _after_move(self):
+        """Schedule whoever moves next; game over is handled by _on_game_event"""
+        if self.controller.game_over:
+            return
+        if self.controller.is_ai_turn():
+            if self._ai_task is None:
+                self._ai_task = self.loop.create_task(self._execute_ai_move())
         else:
-            player = self.controller.board.get(row, col)
-            color = COLOR_X if player == "X" else COLOR_O
-            self.buttons[row][col].config(
-                text=player,
-                fg=color,
-                state=tk.DISABLED
-            )
+            self._start_pondering()
+
+    def _cancel_ai(self):
+        """Abandon a pending AI move and wait until its search thread has stopped"""
+        if self._ai_task:
+            task, self._ai_task = self._ai_task, None
+            task.cancel()
+            self.loop.run_until_complete(asyncio.gather(task, return_exceptions=True))
+
+    def _stop_background(self):
+        """Stop everything that searches on the AI's transposition table"""
+        self._cancel_ai()
+        self._stop_pondering()
+
+    def _pump_async(self):
+        """Run the asyncio loop until it has nothing ready, then hand control back to Tk"""
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        self.root.after(ASYNC_POLL_MS, self._pump_async)
+
+    def _on_game_event(self, event):
+        """Apply one controller event: only the cells it names are redrawn"""
+        if isinstance(event, (PiecePlaced, PieceRemoved)):
+            self._draw_cell(event.row, event.col)
+        elif isinstance(event, TurnChanged):
             self._update_status()
-            self._disable_all_buttons()
-            messagebox.showinfo("🎉 PEMENANG!", result)
-            self._show_mode_selection()
+        elif isinstance(event, GameWon):
+            # Dialog ditampilkan setelah make_move selesai, bukan di tengahnya
+            self.root.after_idle(self._game_over, "🎉 PEMENANG!", f"{event.player} MENANG", event.cells)
+        elif isinstance(event, GameDrawn):
+            self.root.after_idle(self._game_over, "🤝 SERI!", DRAW_MESSAGES[event.reason], [])
+
+    def _game_over(self, title, message, cells):
+        self.view.set_marks({cell: (COLOR_ACCENT, "") for cell in cells})
+        self._update_status()
+        self.view.set_enabled(False)
+        self._stop_background()
+        self._end_session()
+        messagebox.showinfo(title, message)
+        self._show_mode_selection()
+
+    def _draw_cell(self, row, col):
+        self.view.set_cell(row, col, self.controller.board.get(row, col))
 
     def refresh_board(self):
         """Refresh tampilan seluruh board"""
-        for r in range(BOARD_SIZE):
-            for c in range(BOARD_SIZE):
-                cell_value = self.controller.board.get(r, c)
-                if cell_value == "":
-                    self.buttons[r][c].config(text="", fg=BUTTON_FG, state=tk.NORMAL)
-                else:
-                    color = COLOR_X if cell_value == "X" else COLOR_O
-                    self.buttons[r][c].config(text=cell_value, fg=color, state=tk.DISABLED)
-
-    def _execute_ai_move(self):
-        """Execute AI move"""
-        result = self.controller.ai_move()
-        
-        if result == "DRAW_REMOVE":
-            self.refresh_board()
-            # Setelah refresh, jika masih giliran AI, lanjut bermain
-            if self.game_mode == "ai" and self.controller.current_player == "O":
-                self.root.after(800, self._execute_ai_move)
-        elif result is None:
-            row, col = self.controller.move_history[-1][0], self.controller.move_history[-1][1]
-            player = self.controller.board.get(row, col)
-            color = COLOR_X if player == "X" else COLOR_O
-            self.buttons[row][col].config(
-                text=player,
-                fg=color,
-                state=tk.DISABLED
-            )
-            self._update_status()
+        self.view.load(self.controller.board)
+
+    def _start_pondering(self):
+        """Let the AI think on the player's time"""
+        if self.ponderer:
+            self.ponderer.start()
+        self._start_analysis()
+
+    def _stop_pondering(self):
+        if self.ponderer:
+            self.ponderer.stop()
+        self._stop_analysis()
+
+    def _start_analysis(self):
+        """Analyze the player's position in the background and poll for hints"""
+        if not self.show_hints or not self.analyzer or self.controller.game_over:
+            return
+        if self.controller.is_ai_turn():
+            return
+        self.analyzer.start()
+        if self._hint_job is None:
+            self._hint_job = self.root.after(HINT_POLL_MS, self._poll_hints)
+
+    def _stop_analysis(self):
+        if self.analyzer:
+            self.analyzer.stop()
+        if self._hint_job is not None:
+            self.root.after_cancel(self._hint_job)
+            self._hint_job = None
+        self._clear_hints()
+
+    def _toggle_hints(self):
+        self.show_hints = not self.show_hints
+        self.hint_btn.config(text="💡 Hint: ON" if self.show_hints else "💡 Hint: OFF")
+        if self.show_hints:
+            self._start_analysis()
         else:
-            row, col = self.controller.move_history[-1][0], self.controller.move_history[-1][1]
-            player = self.controller.board.get(row, col)
-            color = COLOR_X if player == "X" else COLOR_O
-            self.buttons[row][col].config(
-                text=player,
-                fg=color,
-                state=tk.DISABLED
-            )
-            self._update_status()
-            self._disable_all_buttons()
-            messagebox.showinfo("🎉 PEMENANG!", result)
-            self._show_mode_selection()
+            self._stop_analysis()
+
+    def _poll_hints(self):
+        """Draw the newest analysis result; keeps polling while the search deepens"""
+        self._hint_job = None
+        if not self.analyzer:
+            return
+        running = self.analyzer.is_running()
+        result = self.analyzer.latest()
+        if result is not None:
+            self._draw_hints(result)
+        if running:
+            self._hint_job = self.root.after(HINT_POLL_MS, self._poll_hints)
+
+    def _draw_hints(self, result):
+        """Heatmap of move scores on empty cells plus the principal variation"""
+        controller = self.controller
+        # Hasil untuk posisi lain (pemain sudah jalan) tidak ditampilkan
+        if controller.game_over or result["key"] != controller.board.key(controller.current_player):
+            return
+        scores = result["scores"]
+        if not scores:
+            return
+        
+        low, high = scores[-1][1], scores[0][1]
+        marks = {}
+        for (row, col), score in scores:
+            t = (score - low) / (high - low) if high > low else 1.0
+            marks[(row, col)] = (_blend(HINT_BAD, HINT_GOOD, t), self._format_score(score, result["win_score"]))
+        self.view.set_marks(marks)
+        
+        (best_row, best_col), _ = scores[0]
+        pv = "  ".join(f"{player}({row},{col})" for row, col, player in result["pv"])
+        depth = f"kedalaman {result['depth']}" + ("" if result["final"] else "...")
+        self.hint_label.config(text=f"💡 Saran: ({best_row},{best_col})  |  {depth}\nPV: {pv or '-'}")
+
+    def _clear_hints(self):
+        if not self.view:
+            return
+        self.view.clear_marks()
+        self.hint_label.config(text="")
+
+    @staticmethod
+    def _format_score(score, win_score):
+        if score >= win_score // 2:
+            return "MENANG"
+        if score <= -win_score // 2:
+            return "KALAH"
+        return f"{score:+d}"
 
-    def _disable_all_buttons(self):
-        """Disable all buttons when game ends"""
-        for r in range(BOARD_SIZE):
-            for c in range(BOARD_SIZE):
-                self.buttons[r][c].config(state=tk.DISABLED)
+    def _quit(self):
+        """Stop background work and close the window"""
+        self._stop_background()
+        self._close_session()
+        self.executor.shutdown(wait=False)
+        self.root.quit()
 
     def reset_game(self):
         """Reset game to initial state"""
         self.controller = GameController()
-        for r in range(BOARD_SIZE):
-            for c in range(BOARD_SIZE):
-                self.buttons[r][c].config(text="", fg=BUTTON_FG, state=tk.NORMAL)
+        self.view.clear_marks()
+        self.view.set_enabled(True)
+        self.view.load(self.controller.board)
         self._update_status()